@@ -0,0 +1,94 @@
+"""Benchmark: inserting progress events one ORM object at a time vs in bulk.
+
+Compares ``session.add`` per row (one unit-of-work flush) against
+``bulk_insert`` and ``bulk_upsert``, which send multi-row ``INSERT``
+statements without creating ORM objects. Runs against a temporary SQLite
+database through aiosqlite, or any async URL given on the command line.
+
+Usage:
+    python benchmarks/bench_bulk_insert.py
+    python benchmarks/bench_bulk_insert.py postgresql+asyncpg://localhost/bench
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+from sqlalchemy import Column, Integer, String, delete
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from spool_shared.database import TimestampedModel, bulk_insert, bulk_upsert
+
+ROWS = 20000
+USER_ID = uuid.uuid4()
+
+
+class ProgressEvent(TimestampedModel):
+    __tablename__ = "bench_progress_events"
+
+    student_id = Column(String(64), nullable=False)
+    concept_id = Column(String(64), nullable=False)
+    event_type = Column(String(32), nullable=False)
+    score = Column(Integer, nullable=False)
+
+
+def make_rows():
+    return [
+        {
+            "student_id": f"student-{i % 500}",
+            "concept_id": f"concept-{i % 40}",
+            "event_type": "exercise_completed",
+            "score": i % 100,
+        }
+        for i in range(ROWS)
+    ]
+
+
+async def per_row_add(session: AsyncSession) -> None:
+    for row in make_rows():
+        session.add(ProgressEvent(created_by=USER_ID, updated_by=USER_ID, **row))
+    await session.commit()
+
+
+async def bulk(session: AsyncSession) -> None:
+    await bulk_insert(session, ProgressEvent, make_rows(), user_id=USER_ID)
+    await session.commit()
+
+
+async def upsert(session: AsyncSession) -> None:
+    await bulk_upsert(session, ProgressEvent, make_rows(), user_id=USER_ID)
+    await session.commit()
+
+
+async def main(database_url: str) -> None:
+    engine = create_async_engine(database_url)
+    factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as connection:
+        await connection.run_sync(ProgressEvent.__table__.create, checkfirst=True)
+
+    cases = {"session.add": per_row_add, "bulk_insert": bulk, "bulk_upsert": upsert}
+    try:
+        for name, case in cases.items():
+            async with factory() as session:
+                await session.execute(delete(ProgressEvent.__table__))
+                await session.commit()
+                start = time.perf_counter()
+                await case(session)
+                seconds = time.perf_counter() - start
+            print(f"{name:>12}: {ROWS / seconds:10.0f} rows/s ({seconds * 1000:7.1f} ms)")
+    finally:
+        async with engine.begin() as connection:
+            await connection.run_sync(ProgressEvent.__table__.drop)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        asyncio.run(main(sys.argv[1]))
+    else:
+        with tempfile.TemporaryDirectory() as directory:
+            asyncio.run(main(f"sqlite+aiosqlite:///{os.path.join(directory, 'bench.db')}"))
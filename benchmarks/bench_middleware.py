@@ -0,0 +1,129 @@
+"""Benchmark: per-request overhead of the shared middleware stack.
+
+Compares the previous ``BaseHTTPMiddleware``-based correlation, logging and
+error-handling layers against the pure ASGI versions, all three stacked on
+a trivial endpoint. Requests are driven directly through the ASGI
+interface, so no network or server cost is included.
+
+Usage:
+    python benchmarks/bench_middleware.py
+"""
+
+import asyncio
+import time
+import uuid
+
+import structlog
+from fastapi import FastAPI, Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from spool_shared.middleware import (
+    CorrelationIdMiddleware, ErrorHandlerMiddleware, LoggingMiddleware,
+    error_handler_middleware
+)
+
+
+class LegacyCorrelationIdMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        correlation_id = request.headers.get("X-Correlation-ID") or str(uuid.uuid4())
+        request.state.correlation_id = correlation_id
+        structlog.contextvars.bind_contextvars(
+            correlation_id=correlation_id,
+            path=request.url.path,
+            method=request.method
+        )
+        response = await call_next(request)
+        response.headers["X-Correlation-ID"] = correlation_id
+        structlog.contextvars.clear_contextvars()
+        return response
+
+
+class LegacyLoggingMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        start_time = time.time()
+        logger = structlog.get_logger()
+        logger.info(
+            "Request started",
+            method=request.method,
+            path=request.url.path,
+            query_params=dict(request.query_params),
+            client_host=request.client.host if request.client else None
+        )
+        response = await call_next(request)
+        duration = time.time() - start_time
+        logger.info(
+            "Request completed",
+            status_code=response.status_code,
+            duration_seconds=round(duration, 3),
+            method=request.method,
+            path=request.url.path
+        )
+        response.headers["X-Process-Time"] = str(round(duration, 3))
+        return response
+
+
+def build_app(legacy: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        return {"id": item_id, "name": "item"}
+
+    # Last added is outermost: correlation -> logging -> error handler
+    if legacy:
+        app.add_middleware(BaseHTTPMiddleware, dispatch=error_handler_middleware)
+        app.add_middleware(LegacyLoggingMiddleware)
+        app.add_middleware(LegacyCorrelationIdMiddleware)
+    else:
+        app.add_middleware(ErrorHandlerMiddleware)
+        app.add_middleware(LoggingMiddleware)
+        app.add_middleware(CorrelationIdMiddleware)
+    return app
+
+
+async def drive(app: FastAPI, requests: int) -> float:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/items/42",
+        "raw_path": b"/items/42",
+        "query_string": b"verbose=1",
+        "headers": [(b"host", b"bench"), (b"x-correlation-id", b"bench-id")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return time.perf_counter() - start
+
+
+def main(requests: int = 5000) -> None:
+    # Keep log rendering and I/O out of the measurement
+    structlog.configure(
+        processors=[structlog.contextvars.merge_contextvars],
+        logger_factory=structlog.ReturnLoggerFactory(),
+    )
+
+    for name, legacy in (("BaseHTTPMiddleware", True), ("pure ASGI", False)):
+        app = build_app(legacy)
+        asyncio.run(drive(app, 200))  # warm-up
+        seconds = asyncio.run(drive(app, requests))
+        print(
+            f"{name:>18}: {seconds / requests * 1e6:8.1f} us/request, "
+            f"{requests / seconds:8.0f} req/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
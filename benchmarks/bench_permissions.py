@@ -0,0 +1,71 @@
+"""Microbenchmark: compiled permission masks vs. per-call dict rebuild.
+
+Usage:
+    python benchmarks/bench_permissions.py
+"""
+
+import timeit
+
+from spool_shared.auth.permissions import (
+    Principal, check_permission, effective_mask, has_permission, has_role
+)
+
+
+def legacy_check_permission(user_claims, required_permission, resource_owner=None):
+    """check_permission as it was before the compiled permission tables."""
+    if has_role(user_claims, "admin"):
+        return True
+
+    permissions = user_claims.get("permissions", [])
+    if required_permission in permissions:
+        return True
+
+    if resource_owner and user_claims.get("sub") == resource_owner:
+        return True
+
+    roles = user_claims.get("roles", [])
+    role_permissions = {
+        "instructor": [
+            "view_all_progress",
+            "view_analytics",
+            "create_content",
+            "modify_content"
+        ],
+        "student": [
+            "view_own_progress",
+            "submit_exercises",
+            "earn_badges"
+        ]
+    }
+
+    for role in roles:
+        if required_permission in role_permissions.get(role, []):
+            return True
+
+    return False
+
+
+CLAIMS = {
+    "sub": "user-1",
+    "roles": ["student", "instructor"],
+    "cognito:groups": ["beta"],
+    "permissions": ["reports:read"],
+}
+
+
+def main(number: int = 200_000) -> None:
+    mask = effective_mask(CLAIMS)
+    principal = Principal.from_claims(CLAIMS)
+    cases = {
+        "legacy": lambda: legacy_check_permission(CLAIMS, "modify_content"),
+        "compiled": lambda: check_permission(CLAIMS, "modify_content"),
+        "principal": lambda: check_permission(principal, "modify_content"),
+        "mask": lambda: has_permission(mask, "modify_content"),
+    }
+    for name, case in cases.items():
+        seconds = min(timeit.repeat(case, number=number, repeat=5))
+        print(f"{name:>10}: {seconds / number * 1e9:8.1f} ns/check")
+
+
+if __name__ == "__main__":
+    main()
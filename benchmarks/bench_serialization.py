@@ -0,0 +1,84 @@
+"""Benchmark: rendering a 100-item page and an error response.
+
+Compares the previous ``model_dump()`` + ``JSONResponse`` (stdlib json)
+path against ``ModelJSONResponse`` / ``render_paginated``, which encode
+straight to bytes with pydantic-core.
+
+Usage:
+    python benchmarks/bench_serialization.py
+"""
+
+import timeit
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from spool_shared.schemas import (
+    ErrorResponse, ModelJSONResponse, PaginatedResponse, render_paginated
+)
+
+
+class ExerciseSummary(BaseModel):
+    id: str
+    title: str
+    concept_id: str
+    difficulty: int
+    points: int
+    tags: List[str]
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+
+ITEMS = [
+    ExerciseSummary(
+        id=f"exercise-{i}",
+        title=f"Exercise {i}: fractions and ratios",
+        concept_id=f"concept-{i % 7}",
+        difficulty=i % 5 + 1,
+        points=10 * (i % 5 + 1),
+        tags=["math", "fractions"],
+        created_at=datetime(2024, 1, 1, 12, 0, i % 60),
+    )
+    for i in range(100)
+]
+
+
+def legacy_page() -> bytes:
+    page = PaginatedResponse[ExerciseSummary](
+        items=ITEMS, total=1000, page=1, size=100, pages=10
+    )
+    return JSONResponse(page.model_dump(mode="json")).body
+
+
+def fast_page() -> bytes:
+    return ModelJSONResponse(
+        content=render_paginated(ITEMS, total=1000, page=1, size=100)
+    ).body
+
+
+def legacy_error() -> bytes:
+    error = ErrorResponse(error="NOT_FOUND", detail="Exercise not found", status_code=404)
+    return JSONResponse(status_code=404, content=error.model_dump(mode="json")).body
+
+
+def fast_error() -> bytes:
+    error = ErrorResponse(error="NOT_FOUND", detail="Exercise not found", status_code=404)
+    return ModelJSONResponse(status_code=404, content=error).body
+
+
+def main(number: int = 2000) -> None:
+    cases = {
+        "page legacy": legacy_page,
+        "page fast": fast_page,
+        "error legacy": legacy_error,
+        "error fast": fast_error,
+    }
+    for name, case in cases.items():
+        seconds = min(timeit.repeat(case, number=number, repeat=5))
+        print(f"{name:>13}: {seconds / number * 1e6:8.1f} us/response")
+
+
+if __name__ == "__main__":
+    main()
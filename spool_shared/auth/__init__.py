@@ -1,6 +1,33 @@
 """Authentication utilities."""
 
-from .jwt_utils import decode_jwt_token, verify_token, get_token_claims
-from .permissions import check_permission, has_role
+from .jwt_utils import (
+    decode_jwt_token, verify_token, get_token_claims,
+    decode_jwt_token_async, verify_token_async, verify_many,
+    configure_verification_pool
+)
+from .jwks import JWKSKeyStore, init_jwks, get_jwks_store, cognito_jwks_url
+from .revocation import RevocationList, init_revocation_list, get_revocation_list
+from .token_cache import TokenCache, init_token_cache, get_token_cache
+from .service_tokens import (
+    ServiceTokenMinter, init_service_tokens, get_service_token_minter,
+    verify_service_token, verify_service_token_async
+)
+from .permissions import (
+    check_permission, has_role, effective_mask, has_permission,
+    authorize_many, filter_authorized, require_roles, Principal
+)
+from .dependencies import get_principal, get_optional_principal
 
-__all__ = ["decode_jwt_token", "verify_token", "get_token_claims", "check_permission", "has_role"]
\ No newline at end of file
+__all__ = [
+    "decode_jwt_token", "verify_token", "get_token_claims",
+    "decode_jwt_token_async", "verify_token_async", "verify_many",
+    "configure_verification_pool",
+    "JWKSKeyStore", "init_jwks", "get_jwks_store", "cognito_jwks_url",
+    "TokenCache", "init_token_cache", "get_token_cache",
+    "RevocationList", "init_revocation_list", "get_revocation_list",
+    "ServiceTokenMinter", "init_service_tokens", "get_service_token_minter",
+    "verify_service_token", "verify_service_token_async",
+    "check_permission", "has_role", "effective_mask", "has_permission",
+    "authorize_many", "filter_authorized", "require_roles", "Principal",
+    "get_principal", "get_optional_principal"
+]
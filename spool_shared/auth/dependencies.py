@@ -0,0 +1,60 @@
+"""FastAPI authentication dependencies."""
+
+from typing import Optional
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from .jwt_utils import verify_token_async
+from .permissions import Principal
+
+_bearer_scheme = HTTPBearer(auto_error=False)
+
+
+async def get_principal(
+    request: Request,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(_bearer_scheme)
+) -> Principal:
+    """Resolve the request's principal from its bearer token.
+
+    The token is decoded at most once per request; the principal, with
+    its permission mask, is memoized on ``request.state.principal`` for
+    later dependencies and handlers. Checks against the raw claims dict
+    reuse the same mask.
+
+    Usage:
+        @app.get("/progress")
+        async def progress(principal: Principal = Depends(get_principal)):
+            check_permission(principal, Permission.VIEW_OWN_PROGRESS)
+
+    Raises:
+        HTTPException: If the token is missing or invalid
+    """
+    principal = getattr(request.state, "principal", None)
+    if principal is not None:
+        return principal
+
+    if credentials is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Authentication required",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    claims = await verify_token_async(credentials.credentials)
+    principal = Principal.from_claims(claims)
+    request.state.principal = principal
+    return principal
+
+
+async def get_optional_principal(
+    request: Request,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(_bearer_scheme)
+) -> Optional[Principal]:
+    """Resolve the request's principal, or None for anonymous requests.
+
+    Raises:
+        HTTPException: If a token is present but invalid
+    """
+    if credentials is None and getattr(request.state, "principal", None) is None:
+        return None
+    return await get_principal(request, credentials)
@@ -0,0 +1,220 @@
+"""JWKS key store for RS256 token verification."""
+
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import httpx
+import structlog
+from jose import jwk
+from jose.backends.base import Key
+from jose.exceptions import JWKError
+
+logger = structlog.get_logger()
+
+
+def cognito_jwks_url(region: str, user_pool_id: str) -> str:
+    """Build the JWKS URL for a Cognito user pool.
+
+    Args:
+        region: AWS region of the user pool
+        user_pool_id: Cognito user pool ID
+
+    Returns:
+        JWKS endpoint URL
+    """
+    return (
+        f"https://cognito-idp.{region}.amazonaws.com/"
+        f"{user_pool_id}/.well-known/jwks.json"
+    )
+
+
+class JWKSKeyStore:
+    """In-process cache of parsed JWKS keys indexed by ``kid``.
+
+    Keys are fetched and parsed once per refresh, so verification only does
+    a dict lookup. A background thread refreshes the set every ``ttl_seconds``
+    and an unknown ``kid`` triggers a single-flight refresh: concurrent
+    callers wait on the same fetch instead of issuing their own.
+    """
+
+    def __init__(
+        self,
+        source: str,
+        ttl_seconds: float = 3600.0,
+        min_refresh_interval: float = 30.0,
+        timeout: float = 5.0,
+        default_algorithm: str = "RS256"
+    ):
+        """Initialize key store.
+
+        Args:
+            source: JWKS URL (http/https) or path to a local JWKS file
+            ttl_seconds: Interval between background refreshes
+            min_refresh_interval: Minimum seconds between refreshes triggered
+                by unknown key IDs
+            timeout: HTTP timeout for fetching the key set
+            default_algorithm: Algorithm used for keys without an ``alg`` field
+        """
+        self.source = source
+        self.ttl_seconds = ttl_seconds
+        self.min_refresh_interval = min_refresh_interval
+        self.timeout = timeout
+        self.default_algorithm = default_algorithm
+
+        self._keys: Dict[str, Key] = {}
+        self._refresh_lock = threading.Lock()
+        self._generation = 0
+        self._last_refresh = 0.0
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def kids(self) -> list:
+        """Key IDs currently loaded."""
+        return list(self._keys)
+
+    def _fetch(self) -> Dict[str, Any]:
+        """Load the raw JWKS document from the configured source."""
+        if self.source.startswith(("http://", "https://")):
+            response = httpx.get(self.source, timeout=self.timeout)
+            response.raise_for_status()
+            return response.json()
+
+        path = self.source[len("file://"):] if self.source.startswith("file://") else self.source
+        return json.loads(Path(path).read_text(encoding="utf-8"))
+
+    def _parse(self, document: Dict[str, Any]) -> Dict[str, Key]:
+        """Construct key objects for every usable entry in a JWKS document."""
+        keys: Dict[str, Key] = {}
+        for key_data in document.get("keys", []):
+            kid = key_data.get("kid")
+            if not kid or key_data.get("use", "sig") != "sig":
+                continue
+            try:
+                keys[kid] = jwk.construct(
+                    key_data,
+                    algorithm=key_data.get("alg", self.default_algorithm)
+                )
+            except JWKError as e:
+                logger.warning("Skipping invalid JWKS key", kid=kid, error=str(e))
+        return keys
+
+    def refresh(self) -> None:
+        """Fetch and parse the key set, replacing the cached keys.
+
+        Raises:
+            Exception: If the key set cannot be fetched or parsed
+        """
+        with self._refresh_lock:
+            self._refresh_locked()
+
+    def _refresh_locked(self) -> None:
+        keys = self._parse(self._fetch())
+        # Swap the whole dict so readers never see a partial update
+        self._keys = keys
+        self._generation += 1
+        self._last_refresh = time.monotonic()
+        logger.info("JWKS refreshed", source=self.source, key_count=len(keys))
+
+    def get_key(self, kid: Optional[str]) -> Optional[Key]:
+        """Get the parsed key for a key ID.
+
+        Unknown key IDs trigger at most one refresh per
+        ``min_refresh_interval``, shared by all concurrent callers.
+
+        Args:
+            kid: Key ID from the token header
+
+        Returns:
+            Parsed key, or None if the key ID is unknown
+        """
+        if kid is None:
+            return None
+
+        key = self._keys.get(kid)
+        if key is not None:
+            return key
+
+        generation = self._generation
+        with self._refresh_lock:
+            # Another caller refreshed while we waited for the lock
+            if self._generation != generation:
+                return self._keys.get(kid)
+
+            if time.monotonic() - self._last_refresh < self.min_refresh_interval:
+                return None
+
+            try:
+                self._refresh_locked()
+            except Exception as e:
+                # Keep serving the previous key set and back off
+                self._last_refresh = time.monotonic()
+                logger.error("JWKS refresh failed", source=self.source, error=str(e))
+                return None
+
+        return self._keys.get(kid)
+
+    def start(self) -> None:
+        """Start background refresh thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="jwks-refresh",
+            daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop background refresh thread."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.ttl_seconds):
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error("JWKS refresh failed", source=self.source, error=str(e))
+
+
+# Global key store instance
+_jwks_store: Optional[JWKSKeyStore] = None
+
+
+def init_jwks(source: str, background_refresh: bool = True, **kwargs) -> JWKSKeyStore:
+    """Initialize global JWKS key store.
+
+    Loads the key set eagerly so the first requests never fetch keys.
+
+    Args:
+        source: JWKS URL or path to a local JWKS file
+        background_refresh: Whether to start the refresh thread
+        **kwargs: Additional key store configuration
+
+    Returns:
+        JWKS key store
+    """
+    global _jwks_store
+    if _jwks_store is not None:
+        _jwks_store.stop()
+
+    store = JWKSKeyStore(source, **kwargs)
+    store.refresh()
+    if background_refresh:
+        store.start()
+
+    _jwks_store = store
+    return store
+
+
+def get_jwks_store() -> Optional[JWKSKeyStore]:
+    """Get global JWKS key store, if initialized."""
+    return _jwks_store
@@ -1,27 +1,70 @@
 """JWT token utilities."""
 
-from typing import Dict, Any, Optional
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Hashable, List, Optional, Tuple, Union
 from datetime import datetime, timezone
 import structlog
 from jose import jwt, JWTError
 from fastapi import HTTPException, status
 
+from .jwks import get_jwks_store
+from .revocation import get_revocation_list
+from .token_cache import TokenCache, get_token_cache
+
 logger = structlog.get_logger()
 
 
+def _cache_lookup(
+    token: str,
+    secret_key: Optional[str],
+    algorithms: list,
+    audience: Optional[str]
+) -> Tuple[Optional[TokenCache], Optional[Hashable], Optional[Dict[str, Any]]]:
+    """Look up a verified payload in the global token cache.
+    
+    Tokens that would be decoded without signature verification (no
+    ``secret_key`` and no JWKS store) bypass the cache entirely, so an
+    unverified payload is never served once verification is configured.
+    """
+    cache = get_token_cache()
+    if cache is None:
+        return None, None, None
+    if not secret_key and get_jwks_store() is None:
+        return None, None, None
+    
+    cache_key = cache.make_key(token, secret_key, audience, tuple(algorithms))
+    if cache_key is None:
+        return cache, None, None
+    
+    return cache, cache_key, cache.get(cache_key)
+
+
 def decode_jwt_token(
     token: str,
     secret_key: Optional[str] = None,
     algorithms: list = ["RS256"],
-    verify_exp: bool = True
+    verify_exp: bool = True,
+    audience: Optional[str] = None
 ) -> Dict[str, Any]:
     """Decode and validate JWT token.
     
+    Without a ``secret_key`` the signature is verified against the global
+    JWKS key store (see ``init_jwks``). If no key store is initialized the
+    token is decoded without signature verification. Verified payloads are
+    served from the global token cache when one is enabled (see
+    ``init_token_cache``); unverified payloads are never cached. Tokens
+    whose ``jti`` is on the global revocation list (see
+    ``init_revocation_list``) are rejected.
+    
     Args:
         token: JWT token string
         secret_key: Secret key for validation (optional for RS256)
         algorithms: List of allowed algorithms
         verify_exp: Whether to verify expiration
+        audience: Expected ``aud`` claim (not checked if omitted)
         
     Returns:
         Decoded token payload
@@ -29,23 +72,65 @@ def decode_jwt_token(
     Raises:
         HTTPException: If token is invalid
     """
+    cache, cache_key, payload = _cache_lookup(token, secret_key, algorithms, audience)
+    if payload is None:
+        payload = _decode(token, secret_key, algorithms, verify_exp, audience)
+        if cache_key is not None:
+            cache.put(cache_key, payload)
+    
+    _check_revoked(payload)
+    return payload
+
+
+def _check_revoked(payload: Dict[str, Any]) -> None:
+    """Reject tokens whose ``jti`` is on the global revocation list."""
+    revocations = get_revocation_list()
+    if revocations is not None and revocations.is_revoked(payload.get("jti")):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+def _decode(
+    token: str,
+    secret_key: Optional[str],
+    algorithms: list,
+    verify_exp: bool,
+    audience: Optional[str]
+) -> Dict[str, Any]:
+    """Decode token without consulting the token cache."""
     try:
-        # For RS256, we typically verify with public key
-        # In production, this would fetch from Cognito JWKS
-        options = {"verify_exp": verify_exp}
+        options = {"verify_exp": verify_exp, "verify_aud": audience is not None}
         
         if secret_key:
             payload = jwt.decode(
                 token,
                 secret_key,
                 algorithms=algorithms,
-                options=options
+                options=options,
+                audience=audience
+            )
+        elif (key_store := get_jwks_store()) is not None:
+            # Verify against cached, pre-parsed JWKS public keys
+            header = jwt.get_unverified_header(token)
+            key = key_store.get_key(header.get("kid"))
+            if key is None:
+                raise JWTError("Unknown signing key")
+            
+            payload = jwt.decode(
+                token,
+                key,
+                algorithms=algorithms,
+                options=options,
+                audience=audience
             )
         else:
-            # In production, verify against Cognito public keys
-            # For now, decode without verification
+            # No key store configured, decode without verification
             payload = jwt.decode(
                 token,
+                None,
                 options={"verify_signature": False, **options}
             )
         
@@ -74,7 +159,12 @@ def verify_token(token: str, required_claims: Optional[list] = None) -> Dict[str
         HTTPException: If token is invalid or missing claims
     """
     payload = decode_jwt_token(token)
-    
+    _check_claims(payload, required_claims)
+    return payload
+
+
+def _check_claims(payload: Dict[str, Any], required_claims: Optional[list]) -> None:
+    """Check required claims and expiration of a decoded payload."""
     # Check required claims
     if required_claims:
         missing_claims = [
@@ -96,8 +186,6 @@ def verify_token(token: str, required_claims: Optional[list] = None) -> Dict[str
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Token has expired"
             )
-    
-    return payload
 
 
 def get_token_claims(token: str, claim_names: list) -> Dict[str, Any]:
@@ -115,4 +203,122 @@ def get_token_claims(token: str, claim_names: list) -> Dict[str, Any]:
     return {
         claim: payload.get(claim)
         for claim in claim_names
-    }
\ No newline at end of file
+    }
+
+
+# Bounded pool for signature verification off the event loop
+_verify_executor: Optional[ThreadPoolExecutor] = None
+_verify_max_workers = 4
+
+
+def configure_verification_pool(max_workers: int = 4) -> None:
+    """Configure thread pool used by async token verification.
+    
+    The pool size caps how many signature checks run concurrently;
+    additional requests queue until a worker is free.
+    
+    Args:
+        max_workers: Maximum concurrent signature verifications
+    """
+    global _verify_executor, _verify_max_workers
+    if _verify_executor is not None:
+        _verify_executor.shutdown(wait=False)
+        _verify_executor = None
+    _verify_max_workers = max_workers
+
+
+def _get_verify_executor() -> ThreadPoolExecutor:
+    global _verify_executor
+    if _verify_executor is None:
+        _verify_executor = ThreadPoolExecutor(
+            max_workers=_verify_max_workers,
+            thread_name_prefix="jwt-verify"
+        )
+    return _verify_executor
+
+
+async def decode_jwt_token_async(
+    token: str,
+    secret_key: Optional[str] = None,
+    algorithms: list = ["RS256"],
+    verify_exp: bool = True,
+    audience: Optional[str] = None
+) -> Dict[str, Any]:
+    """Decode and validate JWT token without blocking the event loop.
+    
+    Cache hits are served inline; signature verification runs on the
+    verification thread pool (see ``configure_verification_pool``).
+    
+    Args:
+        token: JWT token string
+        secret_key: Secret key for validation (optional for RS256)
+        algorithms: List of allowed algorithms
+        verify_exp: Whether to verify expiration
+        audience: Expected ``aud`` claim (not checked if omitted)
+        
+    Returns:
+        Decoded token payload
+        
+    Raises:
+        HTTPException: If token is invalid
+    """
+    cache, cache_key, payload = _cache_lookup(token, secret_key, algorithms, audience)
+    if payload is None:
+        # Copy context so structlog context vars reach the worker thread
+        ctx = contextvars.copy_context()
+        loop = asyncio.get_running_loop()
+        payload = await loop.run_in_executor(
+            _get_verify_executor(),
+            functools.partial(ctx.run, _decode, token, secret_key, algorithms, verify_exp, audience)
+        )
+        if cache_key is not None:
+            cache.put(cache_key, payload)
+    
+    _check_revoked(payload)
+    return payload
+
+
+async def verify_token_async(
+    token: str,
+    required_claims: Optional[list] = None
+) -> Dict[str, Any]:
+    """Verify token and check required claims without blocking the event loop.
+    
+    Args:
+        token: JWT token
+        required_claims: List of required claim names
+        
+    Returns:
+        Token payload if valid
+        
+    Raises:
+        HTTPException: If token is invalid or missing claims
+    """
+    payload = await decode_jwt_token_async(token)
+    _check_claims(payload, required_claims)
+    return payload
+
+
+async def verify_many(
+    tokens: List[str],
+    required_claims: Optional[list] = None
+) -> List[Union[Dict[str, Any], HTTPException]]:
+    """Verify a batch of tokens in parallel.
+    
+    Args:
+        tokens: JWT tokens
+        required_claims: List of required claim names
+        
+    Returns:
+        Payload or HTTPException for each token, in input order
+    """
+    results = await asyncio.gather(
+        *(verify_token_async(token, required_claims) for token in tokens),
+        return_exceptions=True
+    )
+    
+    for result in results:
+        if isinstance(result, BaseException) and not isinstance(result, HTTPException):
+            raise result
+    
+    return results
@@ -1,19 +1,208 @@
 """Permission checking utilities."""
 
-from typing import List, Dict, Any
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple, TypeVar, Union
 from fastapi import HTTPException, status
 
+from spool_shared.constants.roles import Permission, UserRole, ROLE_PERMISSIONS
+
+T = TypeVar('T')
+
+
+# Compiled permission tables: each Permission gets one bit and each role
+# an integer mask, so a permission check is a single AND.
+PERMISSION_BITS: Dict[str, int] = {
+    permission.value: 1 << index
+    for index, permission in enumerate(Permission)
+}
+
+# Names check_permission accepted before it followed the Permission enum
+_LEGACY_PERMISSIONS = {
+    "view_own_progress": Permission.VIEW_OWN_PROGRESS,
+    "view_all_progress": Permission.VIEW_ALL_PROGRESS,
+    "view_analytics": Permission.VIEW_ALL_ANALYTICS,
+    "create_content": Permission.CREATE_CONTENT,
+    "modify_content": Permission.UPDATE_CONTENT,
+    "submit_exercises": Permission.SUBMIT_EXERCISE,
+}
+for _legacy_name, _permission in _LEGACY_PERMISSIONS.items():
+    PERMISSION_BITS[_legacy_name] = PERMISSION_BITS[_permission.value]
+
+# Legacy student permission with no Permission equivalent
+PERMISSION_BITS["earn_badges"] = 1 << len(Permission)
+
+ALL_PERMISSIONS_MASK = (1 << (len(Permission) + 1)) - 1
+
+ROLE_MASKS: Dict[str, int] = {
+    role.value: sum(PERMISSION_BITS[permission.value] for permission in permissions)
+    for role, permissions in ROLE_PERMISSIONS.items()
+}
+ROLE_MASKS[UserRole.STUDENT.value] |= PERMISSION_BITS["earn_badges"]
+ROLE_MASKS[UserRole.ADMIN.value] = ALL_PERMISSIONS_MASK
+
+
+@lru_cache(maxsize=1024)
+def roles_mask(roles: Tuple[str, ...]) -> int:
+    """Get combined permission mask for roles.
+    
+    Args:
+        roles: Role names
+        
+    Returns:
+        Bitwise OR of the roles' permission masks
+    """
+    mask = 0
+    for role in roles:
+        mask |= ROLE_MASKS.get(role, 0)
+    return mask
+
+
+@lru_cache(maxsize=1024)
+def permissions_mask(permissions: Tuple[str, ...]) -> int:
+    """Get permission mask for explicit permission names.
+    
+    Args:
+        permissions: Permission names (unknown names are ignored)
+        
+    Returns:
+        Bitwise OR of the permissions' bits
+    """
+    mask = 0
+    for permission in permissions:
+        mask |= PERMISSION_BITS.get(permission, 0)
+    return mask
+
+
+# Masks of recently seen claims dicts, keyed by id(). Each entry keeps
+# its dict alive, so an id cannot be reused while it is cached.
+_CLAIMS_MASKS: Dict[int, Tuple[Dict[str, Any], int]] = {}
+_CLAIMS_MASKS_MAX = 1024
+
+
+def effective_mask(user_claims: Dict[str, Any]) -> int:
+    """Compute a principal's effective permission mask.
+    
+    Combines ``roles``, ``cognito:groups`` and explicit ``permissions``.
+    The mask is computed once per claims dict: ``get_principal`` resolves
+    it when the request is authenticated and later checks against the
+    same dict reuse it. Claims dicts are treated as immutable.
+    
+    Args:
+        user_claims: User's JWT claims
+        
+    Returns:
+        Effective permission mask
+    """
+    entry = _CLAIMS_MASKS.get(id(user_claims))
+    if entry is not None and entry[0] is user_claims:
+        return entry[1]
+    
+    mask = roles_mask(tuple(user_claims.get("roles", ())))
+    groups = user_claims.get("cognito:groups")
+    if groups:
+        mask |= roles_mask(tuple(groups))
+    permissions = user_claims.get("permissions")
+    if permissions:
+        mask |= permissions_mask(tuple(permissions))
+    
+    if len(_CLAIMS_MASKS) >= _CLAIMS_MASKS_MAX:
+        _CLAIMS_MASKS.clear()
+    _CLAIMS_MASKS[id(user_claims)] = (user_claims, mask)
+    return mask
+
+
+def has_permission(mask: int, permission: str) -> bool:
+    """Check a permission against a precomputed mask.
+    
+    Args:
+        mask: Effective permission mask (see ``effective_mask``)
+        permission: Permission name
+        
+    Returns:
+        True if the mask grants the permission
+    """
+    return bool(mask & PERMISSION_BITS.get(permission, 0))
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class Principal:
+    """Authenticated caller with precomputed roles and permissions.
+    
+    Built once per request (see ``spool_shared.auth.dependencies``) and
+    accepted anywhere user claims are, so role and permission checks do
+    not re-read or re-allocate from the raw claims.
+    """
+    sub: Optional[str]
+    roles: FrozenSet[str]
+    permissions: FrozenSet[str]
+    mask: int
+    claims: Dict[str, Any] = field(repr=False)
+    
+    @classmethod
+    def from_claims(cls, claims: Dict[str, Any]) -> "Principal":
+        """Build principal from decoded JWT claims.
+        
+        Args:
+            claims: Decoded token payload
+            
+        Returns:
+            Principal
+        """
+        return cls(
+            sub=claims.get("sub"),
+            roles=frozenset(claims.get("roles", ())).union(claims.get("cognito:groups", ())),
+            permissions=frozenset(claims.get("permissions", ())),
+            mask=effective_mask(claims),
+            claims=claims
+        )
+    
+    def has_role(self, role: str) -> bool:
+        """Check if principal has role (from roles or Cognito groups)."""
+        return role in self.roles
+    
+    def has_permission(self, permission: str) -> bool:
+        """Check if principal's roles or explicit grants include permission."""
+        return _has_granted_permission(self, permission)
+
+
+def _subject(user_claims: Union[Dict[str, Any], Principal]) -> Optional[str]:
+    if isinstance(user_claims, Principal):
+        return user_claims.sub
+    return user_claims.get("sub")
+
+
+def _has_granted_permission(
+    user_claims: Union[Dict[str, Any], Principal],
+    required_permission: str
+) -> bool:
+    """Check permission from roles and explicit grants, ignoring ownership."""
+    bit = PERMISSION_BITS.get(required_permission)
+    
+    if isinstance(user_claims, Principal):
+        if bit is not None:
+            return bool(user_claims.mask & bit)
+        return UserRole.ADMIN.value in user_claims.roles or \
+            required_permission in user_claims.permissions
+    
+    if bit is not None:
+        return bool(effective_mask(user_claims) & bit)
+    
+    # Permissions outside the compiled table
+    return has_role(user_claims, UserRole.ADMIN.value) or \
+        required_permission in user_claims.get("permissions", [])
+
 
 def check_permission(
-    user_claims: Dict[str, Any],
+    user_claims: Union[Dict[str, Any], Principal],
     required_permission: str,
     resource_owner: str = None
 ) -> bool:
     """Check if user has required permission.
     
     Args:
-        user_claims: User's JWT claims
-        required_permission: Required permission string
+        user_claims: User's JWT claims or Principal
+        required_permission: Required permission (``Permission`` value)
         resource_owner: Optional resource owner ID for ownership checks
         
     Returns:
@@ -22,55 +211,96 @@ def check_permission(
     Raises:
         HTTPException: If permission denied
     """
-    # Check if user has admin role
-    if has_role(user_claims, "admin"):
-        return True
-    
-    # Check specific permissions
-    permissions = user_claims.get("permissions", [])
-    if required_permission in permissions:
+    if _has_granted_permission(user_claims, required_permission):
         return True
     
     # Check resource ownership
-    if resource_owner and user_claims.get("sub") == resource_owner:
+    if resource_owner and _subject(user_claims) == resource_owner:
         return True
     
-    # Check role-based permissions
-    roles = user_claims.get("roles", [])
-    role_permissions = {
-        "instructor": [
-            "view_all_progress",
-            "view_analytics",
-            "create_content",
-            "modify_content"
-        ],
-        "student": [
-            "view_own_progress",
-            "submit_exercises",
-            "earn_badges"
-        ]
-    }
-    
-    for role in roles:
-        if required_permission in role_permissions.get(role, []):
-            return True
-    
     raise HTTPException(
         status_code=status.HTTP_403_FORBIDDEN,
         detail=f"Permission denied: {required_permission}"
     )
 
 
-def has_role(user_claims: Dict[str, Any], role: str) -> bool:
+def authorize_many(
+    user_claims: Union[Dict[str, Any], Principal],
+    required_permission: str,
+    owners: Iterable[Optional[str]]
+) -> List[bool]:
+    """Check a permission against many resources at once.
+    
+    Same rules as ``check_permission``, but the principal's permissions
+    are resolved once and denied rows yield False instead of raising.
+    
+    Args:
+        user_claims: User's JWT claims or Principal
+        required_permission: Required permission (``Permission`` value)
+        owners: Owner ID of each resource (None if unowned)
+        
+    Returns:
+        One boolean per owner, True where access is granted
+    """
+    if _has_granted_permission(user_claims, required_permission):
+        return [True for _ in owners]
+    
+    sub = _subject(user_claims)
+    if not sub:
+        return [False for _ in owners]
+    
+    return [owner == sub for owner in owners]
+
+
+def filter_authorized(
+    user_claims: Union[Dict[str, Any], Principal],
+    required_permission: str,
+    items: Iterable[T],
+    owner: Union[str, Callable[[T], Optional[str]]] = "owner_id"
+) -> List[T]:
+    """Filter resources down to those the user may access.
+    
+    Args:
+        user_claims: User's JWT claims or Principal
+        required_permission: Required permission (``Permission`` value)
+        items: Resources to filter (objects or dicts)
+        owner: Attribute/key holding the owner ID, or a callable returning it
+        
+    Returns:
+        Accessible items, in input order
+    """
+    items = list(items)
+    if _has_granted_permission(user_claims, required_permission):
+        return items
+    
+    sub = _subject(user_claims)
+    if not sub:
+        return []
+    
+    if callable(owner):
+        get_owner = owner
+    else:
+        def get_owner(item):
+            if isinstance(item, dict):
+                return item.get(owner)
+            return getattr(item, owner, None)
+    
+    return [item for item in items if get_owner(item) == sub]
+
+
+def has_role(user_claims: Union[Dict[str, Any], Principal], role: str) -> bool:
     """Check if user has specific role.
     
     Args:
-        user_claims: User's JWT claims
+        user_claims: User's JWT claims or Principal
         role: Role to check
         
     Returns:
         True if user has role
     """
+    if isinstance(user_claims, Principal):
+        return role in user_claims.roles
+    
     roles = user_claims.get("roles", [])
     groups = user_claims.get("cognito:groups", [])
     
@@ -87,19 +317,23 @@ def require_roles(required_roles: List[str]):
     Returns:
         Decorator function
     """
+    accepted_roles = frozenset(required_roles)
+    
     def decorator(func):
-        async def wrapper(*args, current_user: Dict[str, Any] = None, **kwargs):
+        async def wrapper(*args, current_user: Union[Dict[str, Any], Principal] = None, **kwargs):
             if not current_user:
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="Authentication required"
                 )
             
-            user_roles = current_user.get("roles", [])
-            user_groups = current_user.get("cognito:groups", [])
-            all_user_roles = set(user_roles + user_groups)
+            if isinstance(current_user, Principal):
+                user_roles = current_user.roles
+            else:
+                user_roles = set(current_user.get("roles", []))
+                user_roles.update(current_user.get("cognito:groups", []))
             
-            if not any(role in all_user_roles for role in required_roles):
+            if accepted_roles.isdisjoint(user_roles):
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail=f"Required roles: {required_roles}"
@@ -108,4 +342,4 @@ def require_roles(required_roles: List[str]):
             return await func(*args, current_user=current_user, **kwargs)
         
         return wrapper
-    return decorator
\ No newline at end of file
+    return decorator
@@ -0,0 +1,247 @@
+"""Token revocation denylist."""
+
+import json
+import threading
+import time
+from array import array
+from pathlib import Path
+from typing import Iterable, MutableMapping, Optional, Tuple
+
+import structlog
+
+logger = structlog.get_logger()
+
+
+class BloomFilter:
+    """Blocked Bloom filter over in-process string hashes.
+
+    All probe bits for a key live in one 64-bit word, so a lookup is one
+    hash, one array read and one AND. Uses Python's ``hash()``, so the
+    filter is only meaningful within the process that built it.
+    """
+
+    def __init__(self, capacity: int, bits_per_entry: int = 12):
+        """Initialize filter.
+
+        Args:
+            capacity: Expected number of entries
+            bits_per_entry: Filter bits per entry (higher means fewer false positives)
+        """
+        words = max(1, capacity * bits_per_entry // 64)
+        # Round up to a power of two so the word index is a mask
+        self._mask = (1 << (words - 1).bit_length()) - 1
+        self._words = array("Q", bytes(8 * (self._mask + 1)))
+
+    @staticmethod
+    def _probe(h: int) -> int:
+        # Six bit positions from disjoint slices of the hash
+        return (
+            (1 << (h >> 20 & 63)) | (1 << (h >> 26 & 63)) | (1 << (h >> 32 & 63))
+            | (1 << (h >> 38 & 63)) | (1 << (h >> 44 & 63)) | (1 << (h >> 50 & 63))
+        )
+
+    def add(self, key: str) -> None:
+        """Add key to the filter."""
+        h = hash(key)
+        self._words[h & self._mask] |= self._probe(h)
+
+    def __contains__(self, key: str) -> bool:
+        h = hash(key)
+        # Inlined _probe: this is the per-request hot path
+        probe = (
+            (1 << (h >> 20 & 63)) | (1 << (h >> 26 & 63)) | (1 << (h >> 32 & 63))
+            | (1 << (h >> 38 & 63)) | (1 << (h >> 44 & 63)) | (1 << (h >> 50 & 63))
+        )
+        return self._words[h & self._mask] & probe == probe
+
+    @property
+    def size_bytes(self) -> int:
+        """Memory used by the filter bits."""
+        return len(self._words) * 8
+
+
+class RevocationList:
+    """Denylist of revoked token IDs (``jti``) with a Bloom pre-filter.
+
+    Lookups check the Bloom filter first and only consult the exact store
+    on a possible hit, so the common not-revoked case never touches it.
+    Entries expire at the revoked token's ``exp``; expired entries are
+    purged and the filter rebuilt every ``purge_interval`` seconds.
+
+    The exact store is any mutable mapping of ``jti`` to ``exp``: a dict by
+    default, or e.g. a ``shelve`` database to keep millions of IDs on disk.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 1_000_000,
+        bits_per_entry: int = 12,
+        store: Optional[MutableMapping[str, float]] = None,
+        purge_interval: float = 300.0
+    ):
+        """Initialize revocation list.
+
+        Args:
+            capacity: Expected number of revoked IDs (sizes the Bloom filter)
+            bits_per_entry: Bloom filter bits per entry
+            store: Exact jti -> exp mapping (default: in-memory dict)
+            purge_interval: Seconds between purges of expired entries
+        """
+        self.capacity = capacity
+        self.bits_per_entry = bits_per_entry
+        self.purge_interval = purge_interval
+        self._store: MutableMapping[str, float] = store if store is not None else {}
+        self._lock = threading.Lock()
+        self._source_offset = 0
+        self._last_purge = time.monotonic()
+        self._rebuild()
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def _rebuild(self) -> None:
+        bloom = BloomFilter(max(self.capacity, len(self._store)), self.bits_per_entry)
+        for jti in self._store.keys():
+            bloom.add(jti)
+        self._bloom = bloom
+
+    def revoke(self, jti: str, exp: float) -> None:
+        """Revoke a token ID until its expiry.
+
+        Args:
+            jti: Token ID
+            exp: Token expiry (Unix timestamp)
+        """
+        if exp <= time.time():
+            return
+
+        with self._lock:
+            self._store[jti] = exp
+            self._bloom.add(jti)
+
+        self._maybe_purge()
+
+    def update(self, entries: Iterable[Tuple[str, float]]) -> int:
+        """Revoke many token IDs.
+
+        Args:
+            entries: (jti, exp) pairs
+
+        Returns:
+            Number of entries added
+        """
+        now = time.time()
+        added = 0
+        with self._lock:
+            for jti, exp in entries:
+                if exp > now:
+                    self._store[jti] = exp
+                    self._bloom.add(jti)
+                    added += 1
+
+        self._maybe_purge()
+        return added
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        """Check if token ID is revoked.
+
+        Args:
+            jti: Token ID
+
+        Returns:
+            True if revoked and not yet expired
+        """
+        if not jti or jti not in self._bloom:
+            return False
+
+        exp = self._store.get(jti)
+        return exp is not None and exp > time.time()
+
+    def _maybe_purge(self) -> None:
+        if time.monotonic() - self._last_purge >= self.purge_interval:
+            self.purge_expired()
+
+    def purge_expired(self) -> int:
+        """Drop expired entries and rebuild the Bloom filter.
+
+        Returns:
+            Number of entries removed
+        """
+        now = time.time()
+        with self._lock:
+            expired = [jti for jti, exp in self._store.items() if exp <= now]
+            for jti in expired:
+                del self._store[jti]
+            self._rebuild()
+            self._last_purge = time.monotonic()
+
+        if expired:
+            logger.info("Purged expired revocations", removed=len(expired), remaining=len(self._store))
+        return len(expired)
+
+    def load_file(self, path: str) -> int:
+        """Load new revocations from an append-only JSON lines file.
+
+        Each line is ``{"jti": "...", "exp": 1700000000}``. Only lines added
+        since the previous call are read, so the file can be polled for
+        incremental updates.
+
+        Args:
+            path: Path to the revocation file
+
+        Returns:
+            Number of entries added
+        """
+        with open(Path(path), "rb") as fh:
+            fh.seek(self._source_offset)
+            data = fh.read()
+
+        # Leave a partially written trailing line for the next poll
+        end = data.rfind(b"\n") + 1
+        self._source_offset += end
+
+        entries = []
+        for line in data[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                entries.append((record["jti"], float(record["exp"])))
+            except (ValueError, KeyError, TypeError) as e:
+                logger.warning("Skipping invalid revocation record", error=str(e))
+
+        return self.update(entries)
+
+    def stats(self) -> dict:
+        """Get denylist size and filter memory."""
+        return {
+            "entries": len(self._store),
+            "bloom_bytes": self._bloom.size_bytes,
+        }
+
+
+# Global revocation list instance
+_revocation_list: Optional[RevocationList] = None
+
+
+def init_revocation_list(source: Optional[str] = None, **kwargs) -> RevocationList:
+    """Initialize global revocation list.
+
+    Args:
+        source: Optional JSON lines file to load initial revocations from
+        **kwargs: Additional revocation list configuration
+
+    Returns:
+        Revocation list
+    """
+    global _revocation_list
+    revocations = RevocationList(**kwargs)
+    if source:
+        revocations.load_file(source)
+    _revocation_list = revocations
+    return revocations
+
+
+def get_revocation_list() -> Optional[RevocationList]:
+    """Get global revocation list, if initialized."""
+    return _revocation_list
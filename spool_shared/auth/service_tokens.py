@@ -0,0 +1,252 @@
+"""Service-to-service token minting."""
+
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import structlog
+from fastapi import HTTPException, status
+from jose import jwk, jwt
+
+from spool_shared.schemas.auth import TokenResponse
+
+from .jwks import get_jwks_store
+from .jwt_utils import decode_jwt_token, decode_jwt_token_async
+
+logger = structlog.get_logger()
+
+
+class ServiceTokenMinter:
+    """Mint and cache tokens for calls between services.
+
+    The signing key is parsed once. Minted tokens are cached per audience
+    and scope set until ``refresh_margin`` seconds before expiry, together
+    with the rendered ``Authorization`` header value, so steady-state calls
+    do no signing work.
+
+    Tokens carry no roles. The requested scopes are placed in the
+    ``permissions`` claim, so the receiver grants exactly those
+    ``Permission`` values and nothing else. Receivers should verify them
+    with ``verify_service_token`` so the ``aud`` claim is checked.
+    """
+
+    def __init__(
+        self,
+        service_name: str,
+        signing_key: str,
+        algorithm: str = "RS256",
+        kid: Optional[str] = None,
+        issuer: Optional[str] = None,
+        lifetime_seconds: int = 300,
+        refresh_margin: int = 30
+    ):
+        """Initialize token minter.
+
+        Args:
+            service_name: Calling service, used as the token subject
+            signing_key: PEM private key (or shared secret for HS algorithms)
+            algorithm: Signing algorithm
+            kid: Key ID placed in the token header
+            issuer: Token issuer (default: service name)
+            lifetime_seconds: Lifetime of minted tokens
+            refresh_margin: Seconds before expiry at which tokens are re-minted
+        """
+        if refresh_margin >= lifetime_seconds:
+            raise ValueError("refresh_margin must be shorter than lifetime_seconds")
+
+        self.service_name = service_name
+        self.algorithm = algorithm
+        self.kid = kid
+        self.issuer = issuer or service_name
+        self.lifetime_seconds = lifetime_seconds
+        self.refresh_margin = refresh_margin
+
+        self._key = jwk.construct(signing_key, algorithm)
+        self._headers = {"kid": kid} if kid else None
+        self._tokens: Dict[Tuple[str, Tuple[str, ...]], Tuple[float, str, str]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, service_name: str, key_path: str, **kwargs) -> "ServiceTokenMinter":
+        """Create minter with a signing key read from a PEM file.
+
+        Args:
+            service_name: Calling service
+            key_path: Path to the PEM private key
+            **kwargs: Additional minter configuration
+
+        Returns:
+            Token minter
+        """
+        return cls(service_name, Path(key_path).read_text(encoding="utf-8"), **kwargs)
+
+    def _mint(self, audience: str, scopes: Tuple[str, ...]) -> Tuple[float, str, str]:
+        now = int(time.time())
+        exp = now + self.lifetime_seconds
+        claims = {
+            "iss": self.issuer,
+            "sub": self.service_name,
+            "aud": audience,
+            "iat": now,
+            "exp": exp,
+            "jti": str(uuid.uuid4()),
+            # Only the requested scopes; no role, so no implied permissions
+            "permissions": list(scopes),
+        }
+        if scopes:
+            claims["scope"] = " ".join(scopes)
+
+        token = jwt.encode(claims, self._key, algorithm=self.algorithm, headers=self._headers)
+        logger.debug("Minted service token", audience=audience, scopes=scopes)
+        return exp - self.refresh_margin, token, f"Bearer {token}"
+
+    def _get(self, audience: str, scopes: Iterable[str]) -> Tuple[float, str, str]:
+        key = (audience, tuple(sorted(set(scopes))))
+        entry = self._tokens.get(key)
+        if entry is not None and time.time() < entry[0]:
+            return entry
+
+        with self._lock:
+            # Another thread may have minted while we waited
+            entry = self._tokens.get(key)
+            if entry is None or time.time() >= entry[0]:
+                entry = self._mint(*key)
+                self._tokens[key] = entry
+        return entry
+
+    def get_token(self, audience: str, scopes: Iterable[str] = ()) -> str:
+        """Get a valid token for an audience and scope set.
+
+        Args:
+            audience: Target service
+            scopes: Requested scopes
+
+        Returns:
+            Encoded JWT
+        """
+        return self._get(audience, scopes)[1]
+
+    def authorization_header(self, audience: str, scopes: Iterable[str] = ()) -> str:
+        """Get a pre-rendered ``Authorization`` header value.
+
+        Args:
+            audience: Target service
+            scopes: Requested scopes
+
+        Returns:
+            ``Bearer <token>`` header value
+        """
+        return self._get(audience, scopes)[2]
+
+    def token_response(self, audience: str, scopes: Iterable[str] = ()) -> TokenResponse:
+        """Get a token wrapped in a ``TokenResponse``.
+
+        Args:
+            audience: Target service
+            scopes: Requested scopes
+
+        Returns:
+            Token response with remaining lifetime
+        """
+        refresh_at, token, _ = self._get(audience, scopes)
+        expires_in = int(refresh_at + self.refresh_margin - time.time())
+        return TokenResponse(access_token=token, expires_in=max(expires_in, 0))
+
+    def invalidate(self) -> None:
+        """Drop all cached tokens (e.g. after key rotation)."""
+        with self._lock:
+            self._tokens.clear()
+
+
+def _require_verification_key(secret_key: Optional[str]) -> None:
+    """Refuse service tokens when no signature can be checked."""
+    if not secret_key and get_jwks_store() is None:
+        logger.error("Service token received with no verification key configured")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+def _check_service_claims(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Reject service tokens without a calling service subject."""
+    if not payload.get("sub"):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Service token missing subject",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return payload
+
+
+def verify_service_token(
+    token: str,
+    service_name: str,
+    secret_key: Optional[str] = None,
+    algorithms: list = ["RS256"]
+) -> Dict[str, Any]:
+    """Verify a service token addressed to this service.
+
+    The ``aud`` claim must equal ``service_name``, so a token minted for
+    another service cannot be replayed here. Unlike ``verify_token``, the
+    signature is always checked: without a ``secret_key`` or an initialized
+    JWKS store the token is rejected.
+
+    Args:
+        token: JWT token
+        service_name: Name of the receiving (local) service
+        secret_key: Secret key for HS algorithms (JWKS store used otherwise)
+        algorithms: List of allowed algorithms
+
+    Returns:
+        Token payload if valid
+
+    Raises:
+        HTTPException: If token is invalid or addressed to another service
+    """
+    _require_verification_key(secret_key)
+    payload = decode_jwt_token(token, secret_key, algorithms, audience=service_name)
+    return _check_service_claims(payload)
+
+
+async def verify_service_token_async(
+    token: str,
+    service_name: str,
+    secret_key: Optional[str] = None,
+    algorithms: list = ["RS256"]
+) -> Dict[str, Any]:
+    """Verify a service token addressed to this service without blocking.
+
+    See ``verify_service_token``.
+    """
+    _require_verification_key(secret_key)
+    payload = await decode_jwt_token_async(token, secret_key, algorithms, audience=service_name)
+    return _check_service_claims(payload)
+
+
+# Global token minter instance
+_service_token_minter: Optional[ServiceTokenMinter] = None
+
+
+def init_service_tokens(service_name: str, signing_key: str, **kwargs) -> ServiceTokenMinter:
+    """Initialize global service token minter.
+
+    Args:
+        service_name: Calling service
+        signing_key: PEM private key or shared secret
+        **kwargs: Additional minter configuration
+
+    Returns:
+        Token minter
+    """
+    global _service_token_minter
+    _service_token_minter = ServiceTokenMinter(service_name, signing_key, **kwargs)
+    return _service_token_minter
+
+
+def get_service_token_minter() -> Optional[ServiceTokenMinter]:
+    """Get global service token minter, if initialized."""
+    return _service_token_minter
@@ -0,0 +1,146 @@
+"""Cache of verified JWT payloads."""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class TokenCache:
+    """Bounded LRU cache of verified token payloads.
+
+    Entries are keyed by a SHA-256 digest of the token (plus the
+    verification parameters), so raw tokens are never kept in memory.
+    No entry outlives the token's ``exp`` claim or ``ttl_seconds``,
+    whichever comes first.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        ttl_seconds: float = 300.0,
+        max_token_length: int = 8192
+    ):
+        """Initialize token cache.
+
+        Args:
+            max_entries: Maximum number of cached payloads
+            ttl_seconds: Maximum lifetime of an entry
+            max_token_length: Tokens longer than this are never cached
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_token_length = max_token_length
+
+        self._entries: "OrderedDict[Hashable, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def make_key(self, token: str, *params: Any) -> Optional[Hashable]:
+        """Build cache key for a token and its verification parameters.
+
+        Args:
+            token: JWT token
+            *params: Verification parameters that affect the result
+
+        Returns:
+            Cache key, or None if the token should not be cached
+        """
+        if len(token) > self.max_token_length:
+            return None
+        return (hashlib.sha256(token.encode()).digest(), *params)
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        """Get cached payload.
+
+        Args:
+            key: Cache key from ``make_key``
+
+        Returns:
+            Copy of the cached payload, or None on miss or expiry
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, payload = entry
+            if now >= expires_at:
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        return dict(payload)
+
+    def put(self, key: Hashable, payload: Dict[str, Any]) -> None:
+        """Cache a verified payload.
+
+        Args:
+            key: Cache key from ``make_key``
+            payload: Verified token payload
+        """
+        now = time.time()
+        expires_at = now + self.ttl_seconds
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, exp)
+
+        if expires_at <= now:
+            return
+
+        with self._lock:
+            self._entries[key] = (expires_at, dict(payload))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Get cache counters.
+
+        Returns:
+            Dictionary with size, hits, misses and evictions
+        """
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+# Global token cache instance (disabled until initialized)
+_token_cache: Optional[TokenCache] = None
+
+
+def init_token_cache(**kwargs) -> TokenCache:
+    """Enable global verified-token cache.
+
+    Args:
+        **kwargs: Token cache configuration
+
+    Returns:
+        Token cache
+    """
+    global _token_cache
+    _token_cache = TokenCache(**kwargs)
+    return _token_cache
+
+
+def get_token_cache() -> Optional[TokenCache]:
+    """Get global token cache, if enabled."""
+    return _token_cache
@@ -1,6 +1,10 @@
 """Database utilities."""
 
 from .base import BaseModel, TimestampedModel, SoftDeleteModel
-from .session import get_session, DatabaseSession
+from .bulk import bulk_insert, bulk_upsert
+from .pool import InstrumentedAsyncQueuePool
+from .session import get_session, get_read_session, DatabaseSession
 
-__all__ = ["BaseModel", "TimestampedModel", "SoftDeleteModel", "get_session", "DatabaseSession"]
\ No newline at end of file
+__all__ = ["BaseModel", "TimestampedModel", "SoftDeleteModel", "get_session",
+           "get_read_session", "DatabaseSession", "InstrumentedAsyncQueuePool",
+           "bulk_insert", "bulk_upsert"]
\ No newline at end of file
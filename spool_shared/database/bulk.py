@@ -0,0 +1,211 @@
+"""Bulk insert and upsert helpers for base models."""
+
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Type, Union
+
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .base import BaseModel, SoftDeleteModel, TimestampedModel
+
+# Columns an upsert never overwrites on existing rows
+_INSERT_ONLY_COLUMNS = frozenset(("id", "created_at", "created_by"))
+
+# Soft-delete state an upsert only overwrites when named in update_columns
+_SOFT_DELETE_COLUMNS = frozenset(("is_deleted", "deleted_at", "deleted_by"))
+
+
+def _prepare_rows(
+    model: Type[BaseModel],
+    rows: Iterable[Mapping[str, Any]],
+    user_id: Optional[Union[str, uuid.UUID]]
+) -> List[Dict[str, Any]]:
+    """Fill primary keys, timestamps and audit columns on the client."""
+    if not (isinstance(model, type) and issubclass(model, BaseModel)):
+        raise TypeError(f"{model!r} is not a BaseModel subclass")
+    if isinstance(user_id, str):
+        user_id = uuid.UUID(user_id)
+
+    now = datetime.utcnow()
+    defaults: Dict[str, Any] = {"created_at": now, "updated_at": now}
+    if issubclass(model, TimestampedModel) and user_id is not None:
+        defaults["created_by"] = user_id
+        defaults["updated_by"] = user_id
+    if issubclass(model, SoftDeleteModel):
+        defaults["is_deleted"] = False
+
+    prepared = []
+    for row in rows:
+        values = {**defaults, **row}
+        if values.get("id") is None:
+            values["id"] = uuid.uuid4()
+        prepared.append(values)
+    return prepared
+
+
+def _dialect_insert(dialect_name: str):
+    if dialect_name == "postgresql":
+        return postgresql.insert
+    if dialect_name == "sqlite":
+        return sqlite.insert
+    return None
+
+
+async def _execute_batches(
+    session: AsyncSession,
+    statement: Any,
+    rows: List[Dict[str, Any]],
+    batch_size: int
+) -> int:
+    """Execute an insert for rows in batches; get the affected row count.
+
+    Where the dialect supports ``RETURNING`` with executemany (PostgreSQL
+    on every driver, SQLite 3.35+), the statement returns the primary key.
+    That makes SQLAlchemy send each batch as one multi-row
+    ``INSERT ... VALUES (...), (...)`` ("insertmanyvalues") compiled once,
+    even on drivers such as asyncpg and psycopg whose plain executemany
+    sends rows one by one, and the returned rows give an exact count that
+    excludes rows skipped by ``ON CONFLICT DO NOTHING``. Other dialects
+    use the driver's executemany and count the rows sent.
+    """
+    connection = await session.connection()
+    returning = connection.dialect.insert_executemany_returning
+    if returning:
+        statement = statement.returning(*statement.table.primary_key.columns)
+    statement = statement.execution_options(insertmanyvalues_page_size=batch_size)
+
+    affected = 0
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        result = await session.execute(statement, batch)
+        affected += len(result.fetchall()) if returning else len(batch)
+    return affected
+
+
+async def bulk_insert(
+    session: AsyncSession,
+    model: Type[BaseModel],
+    rows: Iterable[Mapping[str, Any]],
+    batch_size: int = 1000,
+    user_id: Optional[Union[str, uuid.UUID]] = None,
+    ignore_conflicts: bool = False
+) -> int:
+    """Insert rows in batches.
+
+    ``id``, ``created_at``, ``updated_at`` and, for ``TimestampedModel``
+    and ``SoftDeleteModel`` descendants, the audit columns are filled on
+    the client. Rows are written straight to the table: no ORM objects are
+    created and the session's identity map is not touched. All rows must
+    have the same keys.
+
+    Args:
+        session: Database session (the caller commits)
+        model: ``BaseModel`` descendant
+        rows: Column values per row
+        batch_size: Rows per batch
+        user_id: Stored in ``created_by`` / ``updated_by``
+        ignore_conflicts: Skip rows that violate a unique constraint
+            (``ON CONFLICT DO NOTHING``; PostgreSQL and SQLite)
+
+    Returns:
+        Number of rows inserted
+
+    Raises:
+        ValueError: If ``ignore_conflicts`` is set on a dialect without
+            ``ON CONFLICT`` support
+
+    Usage:
+        await bulk_insert(session, ProgressEvent, events, user_id=user.id)
+    """
+    prepared = _prepare_rows(model, rows, user_id)
+    if not prepared:
+        return 0
+
+    connection = await session.connection()
+    dialect_insert = _dialect_insert(connection.dialect.name)
+    if ignore_conflicts and dialect_insert is None:
+        raise ValueError(f"ignore_conflicts is not supported on {connection.dialect.name}")
+
+    if ignore_conflicts:
+        statement = dialect_insert(model.__table__).on_conflict_do_nothing()
+    else:
+        statement = insert(model.__table__)
+    return await _execute_batches(session, statement, prepared, batch_size)
+
+
+async def bulk_upsert(
+    session: AsyncSession,
+    model: Type[BaseModel],
+    rows: Iterable[Mapping[str, Any]],
+    conflict_columns: Optional[Sequence[str]] = None,
+    update_columns: Optional[Sequence[str]] = None,
+    batch_size: int = 1000,
+    user_id: Optional[Union[str, uuid.UUID]] = None
+) -> int:
+    """Insert rows or update existing ones with ``INSERT ... ON CONFLICT``.
+
+    Columns are filled as in ``bulk_insert``. On conflict, ``id``,
+    ``created_at`` and ``created_by`` keep their stored values and
+    ``updated_at`` (and ``updated_by`` when ``user_id`` is given) are
+    refreshed along with ``update_columns``.
+
+    The soft-delete columns (``is_deleted``, ``deleted_at``,
+    ``deleted_by``) are never part of the default update set, so an
+    upsert does not bring soft-deleted rows back. Callers that mean to
+    change them must name them in ``update_columns`` explicitly, and
+    should set all three consistently.
+
+    Args:
+        session: Database session (the caller commits)
+        model: ``BaseModel`` descendant
+        rows: Column values per row
+        conflict_columns: Columns of the unique constraint to upsert on
+            (default: primary key)
+        update_columns: Columns to overwrite on conflict (default: every
+            given column except ``conflict_columns`` and the soft-delete
+            columns)
+        batch_size: Rows per batch
+        user_id: Stored in ``created_by`` / ``updated_by``
+
+    Returns:
+        Number of rows inserted or updated
+
+    Raises:
+        ValueError: If the dialect has no ``ON CONFLICT`` support
+
+    Usage:
+        await bulk_upsert(
+            session, ConceptProgress, progress, conflict_columns=["user_id", "concept_id"]
+        )
+    """
+    prepared = _prepare_rows(model, rows, user_id)
+    if not prepared:
+        return 0
+
+    connection = await session.connection()
+    dialect_insert = _dialect_insert(connection.dialect.name)
+    if dialect_insert is None:
+        raise ValueError(f"Upsert is not supported on {connection.dialect.name}")
+
+    if conflict_columns is None:
+        conflict_columns = [column.name for column in model.__table__.primary_key]
+    if update_columns is None:
+        update_columns = [
+            name for name in prepared[0]
+            if name not in conflict_columns
+            and name not in _INSERT_ONLY_COLUMNS
+            and name not in _SOFT_DELETE_COLUMNS
+        ]
+    else:
+        update_columns = [*update_columns, "updated_at"]
+        if "updated_by" in prepared[0]:
+            update_columns.append("updated_by")
+
+    statement = dialect_insert(model.__table__)
+    statement = statement.on_conflict_do_update(
+        index_elements=list(conflict_columns),
+        set_={name: statement.excluded[name] for name in dict.fromkeys(update_columns)}
+    )
+    return await _execute_batches(session, statement, prepared, batch_size)
@@ -0,0 +1,201 @@
+"""Connection pool instrumentation, warm-up and liveness checks."""
+
+import asyncio
+import time
+from typing import Optional
+
+import structlog
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, PoolProxiedConnection, QueuePool
+
+from spool_shared.utils.metrics import MetricsRegistry, get_metrics_registry
+
+logger = structlog.get_logger()
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool that records checkout latency.
+
+    Checkout time covers waiting for a free connection (or overflow slot),
+    connecting if the pool has to open a new one, and any pre-ping.
+    """
+
+    engine_role = "primary"
+
+    def connect(self) -> PoolProxiedConnection:
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            get_metrics_registry().observe(
+                "db_pool_checkout_seconds", time.perf_counter() - start, engine=self.engine_role
+            )
+
+    def recreate(self) -> "InstrumentedAsyncQueuePool":
+        # Called by engine.dispose(); keep the metrics label on the new pool
+        pool = super().recreate()
+        pool.engine_role = self.engine_role
+        return pool
+
+
+def _update_gauges(registry: MetricsRegistry, pool: Pool, role: str, returning: bool = False) -> None:
+    """Set the in-use, idle and overflow gauges of a queue pool.
+
+    The ``checkin`` event fires before the connection goes back to the
+    pool, so with ``returning`` the gauges are set as they will be once it
+    is returned: kept idle if the pool has room, closed otherwise.
+    """
+    if not isinstance(pool, QueuePool):
+        return
+    in_use, idle, overflow = pool.checkedout(), pool.checkedin(), pool.overflow()
+    if returning:
+        in_use -= 1
+        if idle < pool.size():
+            idle += 1
+        else:
+            overflow -= 1
+    registry.set_gauge("db_pool_connections_in_use", in_use, engine=role)
+    registry.set_gauge("db_pool_connections_idle", idle, engine=role)
+    registry.set_gauge("db_pool_overflow", max(0, overflow), engine=role)
+
+
+def default_poolclass(database_url: str) -> Optional[type]:
+    """Get the instrumented pool class if the URL would use a queue pool.
+
+    Dialects that pick another pool (e.g. ``StaticPool`` for in-memory
+    SQLite) keep their default.
+    """
+    url = make_url(database_url)
+    dialect = url.get_dialect(_is_async=True)
+    if issubclass(dialect.get_pool_class(url), AsyncAdaptedQueuePool):
+        return InstrumentedAsyncQueuePool
+    return None
+
+
+def instrument_engine(engine: AsyncEngine, role: str) -> None:
+    """Record pool usage and connection churn of an engine.
+
+    Counters track connections opened, closed and invalidated, and the
+    in-use, idle and overflow gauges of queue pools follow the pool's
+    ``checkout`` and ``checkin`` events. Checkout latency is recorded by
+    ``InstrumentedAsyncQueuePool``, which is used for queue-pooled URLs
+    unless another ``poolclass`` is configured.
+
+    Args:
+        engine: Engine to instrument
+        role: ``engine`` label value (``primary``, ``replica-0``, ...)
+    """
+    registry = get_metrics_registry()
+    registry.describe("db_pool_checkout_seconds", "Time to check a connection out of the pool")
+    registry.describe("db_pool_connections_in_use", "Connections checked out of the pool")
+    registry.describe("db_pool_connections_idle", "Connections idle in the pool")
+    registry.describe("db_pool_overflow", "Connections open beyond pool_size")
+    registry.describe("db_pool_connections_opened_total", "Database connections opened")
+    registry.describe("db_pool_connections_closed_total", "Database connections closed")
+    registry.describe("db_pool_invalidations_total", "Database connections invalidated")
+
+    if isinstance(engine.pool, InstrumentedAsyncQueuePool):
+        engine.pool.engine_role = role
+    sync_engine = engine.sync_engine
+
+    def on_connect(*args) -> None:
+        registry.inc("db_pool_connections_opened_total", engine=role)
+
+    def on_close(*args) -> None:
+        registry.inc("db_pool_connections_closed_total", engine=role)
+
+    def on_invalidate(dbapi_connection, connection_record, exception) -> None:
+        registry.inc("db_pool_invalidations_total", engine=role, kind="hard")
+        logger.warning(
+            "Database connection invalidated",
+            engine=role,
+            error=str(exception) if exception is not None else None
+        )
+
+    def on_soft_invalidate(*args) -> None:
+        registry.inc("db_pool_invalidations_total", engine=role, kind="soft")
+
+    def on_checkout(*args) -> None:
+        _update_gauges(registry, sync_engine.pool, role)
+
+    def on_checkin(*args) -> None:
+        _update_gauges(registry, sync_engine.pool, role, returning=True)
+
+    # Pool listeners carry over to the new pool on engine.dispose()
+    event.listen(sync_engine, "connect", on_connect)
+    event.listen(sync_engine, "close", on_close)
+    event.listen(sync_engine, "invalidate", on_invalidate)
+    event.listen(sync_engine, "soft_invalidate", on_soft_invalidate)
+    event.listen(sync_engine, "checkout", on_checkout)
+    event.listen(sync_engine, "checkin", on_checkin)
+
+
+async def warm_up(engine: AsyncEngine, connections: int) -> int:
+    """Open connections in parallel so the first requests find a warm pool.
+
+    Connections beyond ``pool_size`` would be closed again on return, and
+    beyond ``pool_size + max_overflow`` would wait for ``pool_timeout``, so
+    at most ``pool_size`` are opened on queue pools.
+
+    Args:
+        engine: Engine to warm up
+        connections: Connections to open
+
+    Returns:
+        Number of connections opened
+    """
+    if isinstance(engine.pool, QueuePool):
+        connections = min(connections, engine.pool.size())
+
+    async def open_connection() -> AsyncConnection:
+        connection = engine.connect()
+        await connection.start()
+        return connection
+
+    results = await asyncio.gather(
+        *(open_connection() for _ in range(connections)), return_exceptions=True
+    )
+    opened = [result for result in results if isinstance(result, AsyncConnection)]
+    for connection in opened:
+        # Returns the connection to the pool, where it stays open
+        await connection.close()
+
+    failed = len(results) - len(opened)
+    if failed:
+        errors = [result for result in results if not isinstance(result, AsyncConnection)]
+        logger.warning("Pool warm-up incomplete", opened=len(opened), failed=failed, error=str(errors[0]))
+    return len(opened)
+
+
+async def check_liveness(engine: AsyncEngine, role: str) -> bool:
+    """Ping the database through the pool.
+
+    This is a health probe of the database endpoint: it checks out and
+    pings one connection, which says nothing about the other idle
+    connections. If the ping fails with a disconnect error, SQLAlchemy
+    invalidates the whole pool, so connections opened before e.g. a
+    failover are replaced on their next checkout. Idle connections that
+    go stale on their own (dropped by a proxy or firewall) are not
+    detected here; bound their age with ``pool_recycle``, as
+    ``DatabaseSession`` does when ``pool_pre_ping`` is off.
+
+    Args:
+        engine: Engine to check
+        role: ``engine`` label value
+
+    Returns:
+        Whether the database answered
+    """
+    registry = get_metrics_registry()
+    try:
+        async with engine.connect() as connection:
+            await connection.exec_driver_sql("SELECT 1")
+    except Exception as e:
+        registry.set_gauge("db_liveness_ok", 0, engine=role)
+        registry.inc("db_liveness_failures_total", engine=role)
+        logger.warning("Database liveness check failed", engine=role, error=str(e))
+        return False
+    registry.set_gauge("db_liveness_ok", 1, engine=role)
+    return True
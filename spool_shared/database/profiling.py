@@ -0,0 +1,167 @@
+"""Per-request SQL statement profiling."""
+
+import heapq
+import re
+import time
+from typing import Any, Dict, List, Optional
+
+import structlog
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from spool_shared.utils.metrics import get_metrics_registry
+from spool_shared.utils.request_stats import RequestStats, get_request_stats
+
+logger = structlog.get_logger()
+
+# Statements longer than this are truncated in log records
+MAX_STATEMENT_LENGTH = 300
+
+_WHITESPACE = re.compile(r"\s+")
+_IN_LIST = re.compile(r"\bIN \([^()]*\)", re.IGNORECASE)
+_VALUES_LIST = re.compile(r"\bVALUES (\([^()]*\))(?:, \([^()]*\))+", re.IGNORECASE)
+_NUMBERED_PARAM = re.compile(r"\$\d+")
+
+
+def normalize_statement(statement: str) -> str:
+    """Normalize SQL so repeats of one query compare equal.
+
+    Whitespace is collapsed, numbered placeholders become ``?``, and
+    ``IN (...)`` and multi-row ``VALUES`` lists are collapsed, so a query
+    run with different numbers of bound values is still the same query.
+    """
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    statement = _NUMBERED_PARAM.sub("?", statement)
+    statement = _IN_LIST.sub("IN (...)", statement)
+    return _VALUES_LIST.sub(r"VALUES \1, ...", statement)
+
+
+class StatementProfile:
+    """Statements executed during one request."""
+
+    __slots__ = (
+        "correlation_id", "statements", "total_time", "n_plus_one_threshold",
+        "slowest_count", "_by_statement"
+    )
+
+    def __init__(self, n_plus_one_threshold: int, slowest_count: int):
+        self.correlation_id = structlog.contextvars.get_contextvars().get("correlation_id")
+        self.statements = 0
+        self.total_time = 0.0
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.slowest_count = slowest_count
+        # Normalized statement -> [runs, slowest run]
+        self._by_statement: Dict[str, List] = {}
+
+    def record(self, statement: str, duration: float) -> None:
+        """Record one executed statement."""
+        self.statements += 1
+        self.total_time += duration
+        normalized = normalize_statement(statement)
+        entry = self._by_statement.get(normalized)
+        if entry is None:
+            self._by_statement[normalized] = [1, duration]
+        else:
+            entry[0] += 1
+            entry[1] = max(entry[1], duration)
+
+    def slowest(self) -> List[Dict[str, Any]]:
+        """Get the slowest distinct statements, slowest first."""
+        slowest = heapq.nlargest(
+            self.slowest_count, self._by_statement.items(), key=lambda item: item[1][1]
+        )
+        return [
+            {"statement": _truncate(statement), "ms": round(duration * 1000, 2), "count": count}
+            for statement, (count, duration) in slowest
+        ]
+
+    def repeated(self) -> List[Dict[str, Any]]:
+        """Get statements run more than the N+1 threshold."""
+        return [
+            {"statement": _truncate(statement), "count": count}
+            for statement, (count, _) in sorted(
+                self._by_statement.items(), key=lambda item: -item[1][0]
+            )
+            if count > self.n_plus_one_threshold
+        ]
+
+    def finish(self, stats: RequestStats) -> None:
+        """Add the profile to the request's log record and metrics."""
+        route = stats.route or "unmatched"
+        registry = get_metrics_registry()
+        registry.inc("db_statements_total", self.statements, route=route)
+        registry.observe("db_request_time_seconds", self.total_time, route=route)
+
+        stats.set("db_statements", self.statements)
+        stats.set("db_time_seconds", round(self.total_time, 4))
+        stats.set("db_slowest", self.slowest())
+
+        repeated = self.repeated()
+        if repeated:
+            stats.set("db_n_plus_one", repeated)
+            registry.inc("db_n_plus_one_total", len(repeated), route=route)
+            for entry in repeated:
+                logger.warning(
+                    "Likely N+1 query",
+                    route=route,
+                    correlation_id=self.correlation_id,
+                    **entry
+                )
+
+
+def _truncate(statement: str) -> str:
+    if len(statement) <= MAX_STATEMENT_LENGTH:
+        return statement
+    return statement[:MAX_STATEMENT_LENGTH] + "..."
+
+
+def install_statement_profiler(
+    engine: AsyncEngine,
+    n_plus_one_threshold: int = 10,
+    slowest_count: int = 3
+) -> None:
+    """Profile the statements an engine executes for each request.
+
+    Statements run while a request is collecting ``RequestStats`` (see
+    ``LoggingMiddleware``) are counted and timed. When the request ends,
+    its statement count, total database time, slowest statements and any
+    statement repeated more than ``n_plus_one_threshold`` times (a likely
+    N+1 query) are added to its log record; counts, time and N+1 hits are
+    also recorded per route in the metrics registry.
+
+    Args:
+        engine: Engine to profile
+        n_plus_one_threshold: Runs of one normalized statement per request
+            above which it is flagged
+        slowest_count: Slowest statements kept per request
+    """
+    registry = get_metrics_registry()
+    registry.describe("db_statements_total", "SQL statements executed, by route")
+    registry.describe("db_request_time_seconds", "Database time per request, by route")
+    registry.describe("db_n_plus_one_total", "Likely N+1 queries detected, by route")
+
+    sync_engine = engine.sync_engine
+
+    # The start time is kept on the execution context, which is discarded
+    # (with it) if the statement fails
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany) -> None:
+        if context is not None:
+            context._spool_statement_start = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany) -> None:
+        start = getattr(context, "_spool_statement_start", None)
+        if start is None:
+            return
+        duration = time.perf_counter() - start
+        stats = get_request_stats()
+        if stats is None:
+            return
+        profile: Optional[StatementProfile] = stats.state.get("statement_profile")
+        if profile is None:
+            profile = stats.state["statement_profile"] = StatementProfile(
+                n_plus_one_threshold, slowest_count
+            )
+            stats.on_finish(profile.finish)
+        profile.record(statement, duration)
@@ -1,25 +1,226 @@
 """Database session management."""
 
-from typing import AsyncGenerator, Optional
+import asyncio
+import itertools
+import re
+import time
+from typing import AsyncGenerator, List, Optional, Sequence, Tuple
 from contextlib import asynccontextmanager
+from sqlalchemy import event
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession, AsyncEngine, create_async_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import ORMExecuteState, Session, SessionTransaction, UOWTransaction, sessionmaker
+from sqlalchemy.sql.elements import TextClause
 import structlog
 
+from spool_shared.exceptions import DeadlineExceededException
+from spool_shared.utils.metrics import get_metrics_registry
+from spool_shared.utils.deadline import remaining_time
+from spool_shared.utils.request_stats import get_request_stats
+
+from .pool import check_liveness, default_poolclass, instrument_engine, warm_up
+from .profiling import install_statement_profiler
+
 logger = structlog.get_logger()
 
+# PostgreSQL "query_canceled" (raised when statement_timeout fires)
+_QUERY_CANCELED = "57014"
+
+# Request state key set once the request has written through the primary,
+# so later read-only sessions in the same request read their own writes.
+# Kept on the request's RequestStats, so it ends with the request.
+_PRIMARY_STICKY = "primary_sticky"
+_READ_KEYWORDS = frozenset(("SELECT", "SHOW", "EXPLAIN"))
+# A WITH statement counts as a read only if none of these appear in it
+_WRITE_WORDS = re.compile(r"\b(INSERT|UPDATE|DELETE|MERGE)\b", re.IGNORECASE)
+
+# Default pool_recycle (seconds) when pre-ping is replaced by liveness checks
+_LIVENESS_POOL_RECYCLE = 1800
+
+
+class DeadlineSession(Session):
+    """Session whose transactions are bounded by the request deadline.
+    
+    On PostgreSQL each transaction begins with ``SET LOCAL
+    statement_timeout`` set to the time left before the current request's
+    deadline. Other dialects only get the up-front deadline check.
+    
+    A router callable stored in ``info["route"]`` picks the session's
+    engine the first time a bind is needed, so read-only sessions are
+    routed at first use rather than when they are created.
+    """
+    
+    def get_bind(self, mapper=None, **kw):
+        route = self.info.pop("route", None)
+        if route is not None:
+            self.bind = route().sync_engine
+        return super().get_bind(mapper, **kw)
+
+
+@event.listens_for(DeadlineSession, "after_begin")
+def _apply_deadline(session: Session, transaction: SessionTransaction, connection: Connection) -> None:
+    remaining = remaining_time()
+    if remaining is None:
+        return
+    if remaining <= 0:
+        raise DeadlineExceededException()
+    if connection.dialect.name == "postgresql":
+        milliseconds = max(1, int(remaining * 1000))
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {milliseconds}")
+
+
+@event.listens_for(DeadlineSession, "after_begin")
+def _start_hold(session: Session, transaction: SessionTransaction, connection: Connection) -> None:
+    session.info.setdefault("connection_acquired", time.perf_counter())
+
+
+@event.listens_for(DeadlineSession, "after_transaction_end")
+def _end_hold(session: Session, transaction: SessionTransaction) -> None:
+    # The connection goes back to the pool when the root transaction ends
+    if transaction.parent is not None:
+        return
+    acquired = session.info.pop("connection_acquired", None)
+    if acquired is not None:
+        held = time.perf_counter() - acquired
+        session.info["connection_held"] = session.info.get("connection_held", 0.0) + held
+
+
+def _stick_to_primary() -> None:
+    stats = get_request_stats()
+    if stats is not None:
+        stats.state[_PRIMARY_STICKY] = True
+
+
+def _is_primary_sticky() -> bool:
+    stats = get_request_stats()
+    return stats is not None and stats.state.get(_PRIMARY_STICKY, False)
+
+
+@event.listens_for(DeadlineSession, "after_flush")
+def _stick_after_flush(session: Session, flush_context: UOWTransaction) -> None:
+    if not session.info.get("read_only"):
+        _stick_to_primary()
+
+
+@event.listens_for(DeadlineSession, "do_orm_execute")
+def _stick_after_dml(orm_execute_state: ORMExecuteState) -> None:
+    if orm_execute_state.session.info.get("read_only"):
+        return
+    statement = orm_execute_state.statement
+    if isinstance(statement, TextClause):
+        words = statement.text.split(None, 1)
+        keyword = words[0].upper() if words else ""
+        if keyword == "WITH":
+            is_write = _WRITE_WORDS.search(statement.text) is not None
+        else:
+            is_write = bool(keyword) and keyword not in _READ_KEYWORDS
+    else:
+        is_write = orm_execute_state.is_insert or orm_execute_state.is_update \
+            or orm_execute_state.is_delete
+    if is_write:
+        _stick_to_primary()
+
+
+def _has_work(session: AsyncSession) -> bool:
+    """Check whether a session has a transaction or pending changes to commit."""
+    return session.in_transaction() or bool(session.new or session.dirty or session.deleted)
+
+
+def _report_hold_time(session: AsyncSession) -> None:
+    """Record how long a closed session held a connection."""
+    held = session.info.get("connection_held")
+    if held is None:
+        return
+    role = "replica" if session.info.get("replica") else "primary"
+    get_metrics_registry().observe("db_connection_hold_seconds", held, role=role)
+    stats = get_request_stats()
+    if stats is not None:
+        stats.add("db_sessions", 1)
+        stats.add("db_connection_held_seconds", held)
+
+
+def _is_statement_timeout(exc: BaseException) -> bool:
+    """Check whether a database error was a statement timeout."""
+    if not isinstance(exc, DBAPIError):
+        return False
+    orig = exc.orig
+    return _QUERY_CANCELED in (getattr(orig, "sqlstate", None), getattr(orig, "pgcode", None))
+
 
 class DatabaseSession:
-    """Database session manager."""
+    """Database session manager.
+    
+    Writes always go to the primary. Read-only sessions are routed to the
+    replicas (round-robin or least checked-out connections) and never
+    commit. Once a request has written through the primary, its later
+    read-only sessions also use the primary, so it reads its own writes;
+    this lasts until the request ends (requests are tracked by
+    ``LoggingMiddleware``, and work outside a request is never pinned).
+    
+    Pool usage, checkout latency and connection churn of every engine are
+    recorded in the metrics registry. With ``liveness_interval`` set,
+    ``start()`` runs a background endpoint ping instead of pre-pinging on
+    every checkout, and idle connections are recycled after
+    ``pool_recycle`` seconds. Statements are profiled per request (count, database time,
+    slowest statements and likely N+1 queries) for the request log.
+    """
     
-    def __init__(self, database_url: str, **engine_kwargs):
+    def __init__(
+        self,
+        database_url: str,
+        replica_urls: Optional[Sequence[str]] = None,
+        replica_strategy: str = "round_robin",
+        liveness_interval: Optional[float] = None,
+        profile_statements: bool = True,
+        n_plus_one_threshold: int = 10,
+        **engine_kwargs
+    ):
         """Initialize database session manager.
         
         Args:
-            database_url: Database connection URL
-            **engine_kwargs: Additional engine configuration
+            database_url: Primary database connection URL
+            replica_urls: Read replica connection URLs
+            replica_strategy: ``round_robin`` or ``least_connections``
+            liveness_interval: Seconds between background liveness checks;
+                when set, ``pool_pre_ping`` defaults to False and
+                ``pool_recycle`` to 30 minutes
+            profile_statements: Profile statements per request
+            n_plus_one_threshold: Runs of one statement per request above
+                which it is flagged as a likely N+1 query
+            **engine_kwargs: Additional engine configuration (applied to all engines)
         """
-        self.engine = create_async_engine(
+        if replica_strategy not in ("round_robin", "least_connections"):
+            raise ValueError(f"Unknown replica strategy: {replica_strategy}")
+        
+        if liveness_interval is not None:
+            engine_kwargs.setdefault("pool_pre_ping", False)
+            # Without pre-ping, recycle idle connections before a proxy or
+            # firewall silently drops them
+            engine_kwargs.setdefault("pool_recycle", _LIVENESS_POOL_RECYCLE)
+        self.liveness_interval = liveness_interval
+        self._liveness_task: Optional[asyncio.Task] = None
+        
+        self.engine = self._create_engine(database_url, engine_kwargs)
+        self.replica_engines: List[AsyncEngine] = [
+            self._create_engine(url, engine_kwargs) for url in replica_urls or ()
+        ]
+        for role, engine in self._engines():
+            instrument_engine(engine, role)
+            if profile_statements:
+                install_statement_profiler(engine, n_plus_one_threshold)
+        self.replica_strategy = replica_strategy
+        
+        self.async_session = self._sessionmaker(self.engine)
+        self._next_replica = itertools.count()
+    
+    @staticmethod
+    def _create_engine(database_url: str, engine_kwargs: dict) -> AsyncEngine:
+        if "poolclass" not in engine_kwargs and "pool" not in engine_kwargs:
+            poolclass = default_poolclass(database_url)
+            if poolclass is not None:
+                engine_kwargs = {**engine_kwargs, "poolclass": poolclass}
+        return create_async_engine(
             database_url,
             echo=engine_kwargs.get("echo", False),
             pool_pre_ping=engine_kwargs.get("pool_pre_ping", True),
@@ -28,51 +229,157 @@ class DatabaseSession:
             **{k: v for k, v in engine_kwargs.items() 
                if k not in ["echo", "pool_pre_ping", "pool_size", "max_overflow"]}
         )
-        
-        self.async_session = sessionmaker(
-            self.engine,
+    
+    @staticmethod
+    def _sessionmaker(engine: AsyncEngine) -> sessionmaker:
+        return sessionmaker(
+            engine,
             class_=AsyncSession,
+            sync_session_class=DeadlineSession,
             expire_on_commit=False
         )
     
-    async def get_session(self) -> AsyncGenerator[AsyncSession, None]:
+    def _read_engine(self, info: dict) -> AsyncEngine:
+        """Pick the engine for a read-only session."""
+        replicas = self.replica_engines
+        if not replicas or _is_primary_sticky():
+            return self.engine
+        
+        if self.replica_strategy == "least_connections":
+            engine = min(replicas, key=_checked_out)
+        else:
+            engine = replicas[next(self._next_replica) % len(replicas)]
+        info["replica"] = True
+        return engine
+    
+    def _open_session(self, read_only: bool) -> AsyncSession:
+        session = self.async_session()
+        session.info["read_only"] = read_only
+        if read_only:
+            info = session.info
+            info["route"] = lambda: self._read_engine(info)
+        return session
+    
+    async def get_session(self, read_only: bool = False) -> AsyncGenerator[AsyncSession, None]:
         """Get database session.
         
+        Creating the session is cheap: no connection is checked out, and a
+        read-only session picks its replica, until the first statement.
+        The session is committed (or rolled back) only if it did any work.
+        Connection hold time is recorded in the
+        ``db_connection_hold_seconds`` histogram and the request's log
+        record.
+        
+        Args:
+            read_only: Route to a replica and skip the commit
+            
         Yields:
             Database session
         """
-        async with self.async_session() as session:
-            try:
-                yield session
+        session = self._open_session(read_only)
+        try:
+            yield session
+            if not read_only and _has_work(session):
                 await session.commit()
-            except Exception:
+        except Exception as e:
+            if session.in_transaction():
                 await session.rollback()
-                raise
-            finally:
-                await session.close()
+            if _is_statement_timeout(e):
+                raise DeadlineExceededException() from e
+            raise
+        finally:
+            await session.close()
+            _report_hold_time(session)
     
     @asynccontextmanager
-    async def session_scope(self):
+    async def session_scope(self, read_only: bool = False):
         """Session context manager.
         
+        Statements are bounded by the current request deadline; a statement
+        cancelled by that timeout raises ``DeadlineExceededException``.
+        
+        Args:
+            read_only: Route to a replica and skip the commit
+            
         Usage:
             async with db.session_scope() as session:
                 # Use session
+            
+            async with db.session_scope(read_only=True) as session:
+                # Read from a replica
         """
-        async with self.async_session() as session:
+        async with self._open_session(read_only) as session:
             try:
                 yield session
-                await session.commit()
+                if not read_only and _has_work(session):
+                    await session.commit()
             except Exception as e:
                 logger.error("Database session error", error=str(e))
                 await session.rollback()
+                if _is_statement_timeout(e):
+                    raise DeadlineExceededException() from e
                 raise
             finally:
                 await session.close()
+                _report_hold_time(session)
+    
+    def _engines(self) -> List[Tuple[str, AsyncEngine]]:
+        return [("primary", self.engine)] + [
+            (f"replica-{index}", engine) for index, engine in enumerate(self.replica_engines)
+        ]
+    
+    async def start(self, warm_up_connections: int = 0) -> None:
+        """Prepare the pools on application startup.
+        
+        Args:
+            warm_up_connections: Connections to open in parallel on each
+                engine before serving (0 to skip)
+            
+        Usage:
+            @asynccontextmanager
+            async def lifespan(app):
+                await db.start(warm_up_connections=5)
+                yield
+                await db.close()
+        """
+        if warm_up_connections > 0:
+            started = time.perf_counter()
+            opened = await asyncio.gather(*(
+                warm_up(engine, warm_up_connections) for _, engine in self._engines()
+            ))
+            logger.info(
+                "Database pools warmed up",
+                connections=sum(opened),
+                duration_ms=round((time.perf_counter() - started) * 1000, 2)
+            )
+        if self.liveness_interval is not None and self._liveness_task is None:
+            self._liveness_task = asyncio.create_task(self._liveness_loop())
+    
+    async def _liveness_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.liveness_interval)
+            await asyncio.gather(*(
+                check_liveness(engine, role) for role, engine in self._engines()
+            ))
     
     async def close(self):
         """Close database connections."""
+        if self._liveness_task is not None:
+            self._liveness_task.cancel()
+            try:
+                await self._liveness_task
+            except asyncio.CancelledError:
+                pass
+            self._liveness_task = None
         await self.engine.dispose()
+        for engine in self.replica_engines:
+            await engine.dispose()
+
+
+def _checked_out(engine: AsyncEngine) -> int:
+    """Get number of connections checked out of an engine's pool."""
+    checkedout = getattr(engine.pool, "checkedout", None)
+    return checkedout() if checkedout is not None else 0
 
 
 # Global session manager instance
@@ -83,8 +390,9 @@ def init_database(database_url: str, **kwargs) -> DatabaseSession:
     """Initialize global database session.
     
     Args:
-        database_url: Database connection URL
-        **kwargs: Additional configuration
+        database_url: Primary database connection URL
+        **kwargs: Additional configuration (``replica_urls``,
+            ``replica_strategy``, ``liveness_interval`` and engine options)
         
     Returns:
         Database session manager
@@ -107,4 +415,20 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
         raise RuntimeError("Database not initialized. Call init_database first.")
     
     async for session in _db_session.get_session():
+        yield session
+
+
+async def get_read_session() -> AsyncGenerator[AsyncSession, None]:
+    """Get read-only database session (replica if configured) from global manager.
+    
+    Yields:
+        Database session
+        
+    Raises:
+        RuntimeError: If database not initialized
+    """
+    if _db_session is None:
+        raise RuntimeError("Database not initialized. Call init_database first.")
+    
+    async for session in _db_session.get_session(read_only=True):
         yield session
\ No newline at end of file
@@ -3,11 +3,13 @@
 from .base import (
     SpoolException, ValidationException, NotFoundException,
     AuthenticationException, AuthorizationException,
-    ConflictException, RateLimitException
+    ConflictException, RateLimitException, DeadlineExceededException,
+    PayloadTooLargeException, UnsupportedMediaTypeException
 )
 
 __all__ = [
     "SpoolException", "ValidationException", "NotFoundException",
     "AuthenticationException", "AuthorizationException",
-    "ConflictException", "RateLimitException"
+    "ConflictException", "RateLimitException", "DeadlineExceededException",
+    "PayloadTooLargeException", "UnsupportedMediaTypeException"
 ]
\ No newline at end of file
@@ -96,4 +96,39 @@ class RateLimitException(SpoolException):
             error_code="RATE_LIMIT_EXCEEDED",
             headers=headers
         )
-        self.retry_after = retry_after
\ No newline at end of file
+        self.retry_after = retry_after
+
+
+class DeadlineExceededException(SpoolException):
+    """Request deadline exceeded exception."""
+    
+    def __init__(self, detail: str = "Request deadline exceeded"):
+        super().__init__(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail=detail,
+            error_code="DEADLINE_EXCEEDED"
+        )
+
+
+class PayloadTooLargeException(SpoolException):
+    """Request body too large exception."""
+    
+    def __init__(self, max_bytes: int):
+        super().__init__(
+            status_code=413,  # named HTTP_413_CONTENT_TOO_LARGE in newer Starlette
+            detail=f"Request body exceeds {max_bytes} bytes",
+            error_code="PAYLOAD_TOO_LARGE"
+        )
+        self.max_bytes = max_bytes
+
+
+class UnsupportedMediaTypeException(SpoolException):
+    """Unsupported request content type exception."""
+    
+    def __init__(self, content_type: Optional[str]):
+        super().__init__(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Unsupported content type: {content_type or 'none'}",
+            error_code="UNSUPPORTED_MEDIA_TYPE"
+        )
+        self.content_type = content_type
\ No newline at end of file
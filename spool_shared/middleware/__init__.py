@@ -2,6 +2,31 @@
 
 from .correlation import CorrelationIdMiddleware
 from .logging import LoggingMiddleware
-from .error_handler import error_handler_middleware
+from .error_handler import ErrorHandlerMiddleware, error_handler_middleware
+from .error_reporting import ErrorReporter, init_error_reporter, get_error_reporter
+from .rate_limit import (
+    RateLimitMiddleware, RateLimitBackend, MemoryRateLimitBackend,
+    SharedMemoryRateLimitBackend, RateLimit
+)
+from .load_shedding import LoadSheddingMiddleware, AdaptiveConcurrencyLimiter
+from .coalescing import RequestCoalescingMiddleware
+from .body_limits import BodyLimitMiddleware, BodyLimit, get_spooled_body
+from .response_cache import (
+    ResponseCacheMiddleware, ResponseCache, CacheRule, add_cache_tags,
+    init_response_cache, get_response_cache, invalidate_cache_tags
+)
+from .metrics import MetricsMiddleware, MetricsRegistry, get_metrics_registry, metrics_endpoint
 
-__all__ = ["CorrelationIdMiddleware", "LoggingMiddleware", "error_handler_middleware"]
\ No newline at end of file
+__all__ = [
+    "CorrelationIdMiddleware", "LoggingMiddleware",
+    "ErrorHandlerMiddleware", "error_handler_middleware",
+    "ErrorReporter", "init_error_reporter", "get_error_reporter",
+    "RateLimitMiddleware", "RateLimitBackend", "MemoryRateLimitBackend",
+    "SharedMemoryRateLimitBackend", "RateLimit",
+    "LoadSheddingMiddleware", "AdaptiveConcurrencyLimiter",
+    "RequestCoalescingMiddleware",
+    "BodyLimitMiddleware", "BodyLimit", "get_spooled_body",
+    "ResponseCacheMiddleware", "ResponseCache", "CacheRule", "add_cache_tags",
+    "init_response_cache", "get_response_cache", "invalidate_cache_tags",
+    "MetricsMiddleware", "MetricsRegistry", "get_metrics_registry", "metrics_endpoint"
+]
@@ -0,0 +1,273 @@
+"""Request body size and content type enforcement middleware."""
+
+import tempfile
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import structlog
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from spool_shared.constants.limits import ContentLimits, FileUpload
+from spool_shared.exceptions import PayloadTooLargeException, UnsupportedMediaTypeException
+
+from .error_handler import build_error_response
+from .metrics import get_metrics_registry
+
+logger = structlog.get_logger()
+
+# Chunk size used when replaying a spooled body to the application
+REPLAY_CHUNK_SIZE = 64 * 1024
+
+
+@dataclass(frozen=True)
+class BodyLimit:
+    """Body constraints for an endpoint class."""
+    max_bytes: int
+    content_types: Optional[Tuple[str, ...]] = None  # None allows any
+    spool: bool = False  # buffer the body in a spooled temp file first
+
+
+_MULTIPART = "multipart/form-data"
+
+# Text fields are limited in characters; allow 4 UTF-8 bytes each plus
+# room for the rest of the JSON document
+_TEXT_BODY_BYTES = ContentLimits.MAX_RESPONSE_LENGTH * 4 + 64 * 1024
+
+# Limits per endpoint class, from constants.limits
+DEFAULT_BODY_LIMITS: Dict[str, BodyLimit] = {
+    "default": BodyLimit(1024 * 1024),
+    "text": BodyLimit(_TEXT_BODY_BYTES, ("application/json",)),
+    "pdf": BodyLimit(
+        FileUpload.MAX_PDF_SIZE, (*FileUpload.ALLOWED_PDF_TYPES, _MULTIPART), spool=True
+    ),
+    "image": BodyLimit(
+        FileUpload.MAX_IMAGE_SIZE, (*FileUpload.ALLOWED_IMAGE_TYPES, _MULTIPART), spool=True
+    ),
+    "avatar": BodyLimit(
+        FileUpload.MAX_AVATAR_SIZE, (*FileUpload.ALLOWED_IMAGE_TYPES, _MULTIPART), spool=True
+    ),
+}
+
+
+def get_spooled_body(request: Request):
+    """Get the spooled request body file, if the route spools uploads.
+
+    The file is positioned at the start and closed after the response.
+
+    Usage:
+        @app.post("/uploads/pdf")
+        async def upload(request: Request):
+            body = get_spooled_body(request)
+    """
+    return getattr(request.state, "body_file", None)
+
+
+class BodyLimitMiddleware:
+    """Reject oversized or mistyped request bodies before they are buffered.
+
+    Each request is assigned an endpoint class by path prefix (``default``
+    otherwise). A declared ``Content-Length`` over the class limit is
+    rejected with 413 before any body is read, a disallowed
+    ``Content-Type`` with 415 (for requests with a body), and streamed
+    (chunked) bodies are counted as they arrive, before the application
+    is called, and cut off with 413 as soon as they pass the limit.
+
+    For classes with ``spool=True`` the body is first copied into a
+    ``SpooledTemporaryFile`` (kept in memory up to ``spool_threshold``,
+    then on disk), exposed as ``request.state.body_file`` and replayed to
+    the application in small chunks, so a large upload never sits in
+    worker memory.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        limits: Optional[Dict[str, BodyLimit]] = None,
+        route_classes: Optional[Dict[str, str]] = None,
+        spool_threshold: int = 1024 * 1024,
+        spool_dir: Optional[str] = None
+    ):
+        """Initialize body limit middleware.
+
+        Args:
+            app: ASGI application
+            limits: Limits per endpoint class
+            route_classes: Path prefix to endpoint class, e.g.
+                ``{"/uploads/pdf": "pdf"}``
+            spool_threshold: Bytes kept in memory before spooling to disk
+            spool_dir: Directory for spooled files (default: temp dir)
+        """
+        self.app = app
+        self.limits = {**DEFAULT_BODY_LIMITS, **(limits or {})}
+        self.route_classes = sorted(
+            (route_classes or {}).items(), key=lambda item: len(item[0]), reverse=True
+        )
+        self.spool_threshold = spool_threshold
+        self.spool_dir = spool_dir
+
+    def _endpoint_class(self, path: str) -> str:
+        for prefix, endpoint_class in self.route_classes:
+            if path.startswith(prefix):
+                return endpoint_class
+        return "default"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] in ("GET", "HEAD", "OPTIONS"):
+            await self.app(scope, receive, send)
+            return
+
+        endpoint_class = self._endpoint_class(scope["path"])
+        limit = self.limits[endpoint_class]
+
+        content_length = None
+        content_type = None
+        chunked = False
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                content_length = value
+            elif name == b"content-type":
+                content_type = value.decode("latin-1")
+            elif name == b"transfer-encoding":
+                chunked = b"chunked" in value.lower()
+
+        error: Optional[Exception] = None
+        has_body = chunked
+        if content_length is not None:
+            try:
+                length = int(content_length)
+            except ValueError:
+                length = limit.max_bytes + 1
+            has_body = has_body or length > 0
+            if length > limit.max_bytes:
+                error = PayloadTooLargeException(limit.max_bytes)
+        if error is None and has_body and limit.content_types is not None:
+            media_type = (content_type or "").split(";", 1)[0].strip().lower()
+            if media_type not in limit.content_types:
+                error = UnsupportedMediaTypeException(content_type)
+
+        if error is not None:
+            await self._reject(scope, receive, send, error, endpoint_class)
+            return
+
+        if limit.spool:
+            await self._spooled(scope, receive, send, limit, endpoint_class)
+            return
+
+        if not chunked:
+            # The server holds the body to the declared Content-Length,
+            # which has already been checked
+            await self.app(scope, receive, send)
+            return
+
+        # Count a chunked body before the application sees any of it: an
+        # exception raised from inside receive() would reach the app's own
+        # exception handlers first and never come back here
+        chunks = []
+        received = 0
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            chunk = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            received += len(chunk)
+            if received > limit.max_bytes:
+                await self._reject(
+                    scope, receive, send,
+                    PayloadTooLargeException(limit.max_bytes), endpoint_class
+                )
+                return
+            chunks.append(chunk)
+
+        replay_done = False
+
+        async def replay() -> Message:
+            nonlocal replay_done
+            if replay_done:
+                return await receive()
+            replay_done = True
+            return {"type": "http.request", "body": b"".join(chunks), "more_body": False}
+
+        await self.app(scope, replay, send)
+
+    async def _spooled(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+        limit: BodyLimit,
+        endpoint_class: str
+    ) -> None:
+        body_file = tempfile.SpooledTemporaryFile(
+            max_size=self.spool_threshold, dir=self.spool_dir
+        )
+        try:
+            received = 0
+            more_body = True
+            while more_body:
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    return
+                chunk = message.get("body", b"")
+                more_body = message.get("more_body", False)
+                received += len(chunk)
+                if received > limit.max_bytes:
+                    await self._reject(
+                        scope, receive, send,
+                        PayloadTooLargeException(limit.max_bytes), endpoint_class
+                    )
+                    return
+                # The file rolls over to disk once it holds more than
+                # spool_threshold bytes; that write and later ones block
+                if received > self.spool_threshold:
+                    await run_in_threadpool(body_file.write, chunk)
+                else:
+                    body_file.write(chunk)
+
+            body_file.seek(0)
+            scope.setdefault("state", {})["body_file"] = body_file
+            on_disk = received > self.spool_threshold
+            replay_done = False
+
+            async def replay() -> Message:
+                nonlocal replay_done
+                if replay_done:
+                    return await receive()
+                chunk = await run_in_threadpool(body_file.read, REPLAY_CHUNK_SIZE) \
+                    if on_disk else body_file.read(REPLAY_CHUNK_SIZE)
+                replay_done = body_file.tell() >= received
+                if replay_done:
+                    # Leave the file at the start for handlers using body_file
+                    body_file.seek(0)
+                return {"type": "http.request", "body": chunk, "more_body": not replay_done}
+
+            await self.app(scope, replay, send)
+        finally:
+            body_file.close()
+
+    @staticmethod
+    async def _reject(
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+        error: Exception,
+        endpoint_class: str
+    ) -> None:
+        get_metrics_registry().inc("request_body_rejected_total", endpoint_class=endpoint_class)
+        logger.info(
+            "Request body rejected",
+            endpoint_class=endpoint_class,
+            error=getattr(error, "error_code", type(error).__name__)
+        )
+        response = build_error_response(
+            error,
+            request_id=scope.get("state", {}).get("correlation_id"),
+            path=scope["path"],
+            method=scope["method"]
+        )
+        # Do not read the rest of the body; ask the client to stop sending
+        response.headers["Connection"] = "close"
+        await response(scope, receive, send)
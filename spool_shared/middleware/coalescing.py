@@ -0,0 +1,183 @@
+"""Request coalescing (single-flight) middleware."""
+
+import asyncio
+import hashlib
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .metrics import MetricsRegistry, get_metrics_registry
+
+# (status, headers, body) of a completed response
+RenderedResponse = Tuple[int, List[Tuple[bytes, bytes]], bytes]
+
+
+class _Uncacheable(Exception):
+    """Leader response must not be shared; waiters run the request themselves."""
+
+
+class _Flight:
+    """An in-flight leader request and the number of requests waiting on it."""
+
+    __slots__ = ("future", "waiters")
+
+    def __init__(self) -> None:
+        self.future: "asyncio.Future[RenderedResponse]" = asyncio.get_running_loop().create_future()
+        self.waiters = 0
+
+
+class RequestCoalescingMiddleware:
+    """Collapse concurrent identical GET requests onto one computation.
+
+    For paths under one of ``paths``, the first request for a key runs the
+    application (and streams its response as usual) while identical requests
+    arriving before it completes wait and are answered with the same status,
+    headers and body bytes. The key is built from method, path, normalized
+    query string and, unless ``per_principal`` is False, the caller's
+    principal (or a hash of its ``Authorization`` or ``Cookie`` header).
+
+    Responses that set cookies are never shared. If the leader fails, its
+    waiters fail with the same exception.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        paths: Sequence[str],
+        per_principal: bool = True,
+        registry: Optional[MetricsRegistry] = None
+    ):
+        """Initialize coalescing middleware.
+
+        Args:
+            app: ASGI application
+            paths: Path prefixes to coalesce (e.g. ``["/leaderboard"]``)
+            per_principal: Only share responses between requests of the same
+                principal; set False for public, user-independent endpoints
+            registry: Metrics registry (default: global registry)
+        """
+        self.app = app
+        self.paths = sorted(paths, key=len, reverse=True)
+        self.per_principal = per_principal
+        self.registry = registry or get_metrics_registry()
+        self.registry.describe("coalesced_requests_total", "Requests answered from another in-flight request")
+        self.registry.describe("coalescing_leaders_total", "Requests whose response was shared with waiters")
+        self._in_flight: Dict[Tuple, _Flight] = {}
+
+    def _prefix(self, path: str) -> Optional[str]:
+        for prefix in self.paths:
+            if path.startswith(prefix):
+                return prefix
+        return None
+
+    def _key(self, scope: Scope) -> Tuple:
+        principal = None
+        if self.per_principal:
+            principal = _principal_scope(scope)
+        return scope["method"], scope["path"], _normalized_query(scope), principal
+
+    def stats(self) -> Dict[str, int]:
+        """Get in-flight coalescing state."""
+        return {
+            "in_flight": len(self._in_flight),
+            "waiting": sum(flight.waiters for flight in self._in_flight.values()),
+        }
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+
+        prefix = self._prefix(scope["path"])
+        if prefix is None:
+            await self.app(scope, receive, send)
+            return
+
+        key = self._key(scope)
+        flight = self._in_flight.get(key)
+        if flight is not None:
+            flight.waiters += 1
+            try:
+                status, headers, body = await asyncio.shield(flight.future)
+            except _Uncacheable:
+                await self.app(scope, receive, send)
+                return
+            self.registry.inc("coalesced_requests_total", route=prefix)
+            await send({"type": "http.response.start", "status": status, "headers": headers})
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        flight = self._in_flight[key] = _Flight()
+        try:
+            await self._lead(scope, receive, send, flight.future)
+        finally:
+            del self._in_flight[key]
+            if flight.waiters:
+                self.registry.inc("coalescing_leaders_total", route=prefix)
+
+    async def _lead(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+        flight: "asyncio.Future[RenderedResponse]"
+    ) -> None:
+        start: Optional[Message] = None
+        chunks: List[bytes] = []
+
+        async def send_and_record(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_and_record)
+        except BaseException as exc:
+            if isinstance(exc, Exception):
+                flight.set_exception(exc)
+            else:
+                # Cancelled (e.g. client gone): let waiters run on their own
+                flight.set_exception(_Uncacheable())
+            # Waiters may not exist; avoid "exception never retrieved"
+            flight.exception()
+            raise
+
+        headers = list(start.get("headers", ())) if start is not None else []
+        if start is None or any(name.lower() == b"set-cookie" for name, _ in headers):
+            flight.set_exception(_Uncacheable())
+            flight.exception()
+            return
+        flight.set_result((start["status"], headers, b"".join(chunks)))
+
+
+def _normalized_query(scope: Scope) -> str:
+    """Get the query string with parameters in a canonical order."""
+    query = scope.get("query_string", b"")
+    if not query:
+        return ""
+    return urlencode(sorted(parse_qsl(query.decode("latin-1"), keep_blank_values=True)))
+
+
+def _principal_scope(scope: Scope) -> Optional[str]:
+    """Identify the caller for request keys.
+
+    Uses the resolved principal, else the ``Authorization`` header, else
+    the ``Cookie`` header, so cookie-authenticated requests never share the
+    anonymous key.
+    """
+    principal = scope.get("state", {}).get("principal")
+    if principal is not None and principal.sub:
+        return f"user:{principal.sub}"
+    cookie = None
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            return "auth:" + hashlib.sha256(value).hexdigest()
+        if name == b"cookie":
+            cookie = value if cookie is None else cookie + b"; " + value
+    if cookie is not None:
+        return "cookie:" + hashlib.sha256(cookie).hexdigest()
+    return None
@@ -1,40 +1,126 @@
 """Correlation ID middleware."""
 
+import asyncio
 import uuid
-from typing import Callable
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from typing import Optional
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import structlog
 
+from spool_shared.exceptions import DeadlineExceededException
+from spool_shared.utils.deadline import (
+    DEADLINE_HEADER, TIMEOUT_HEADER, parse_deadline, set_deadline, reset_deadline
+)
+
+from .error_handler import build_error_response
+
 logger = structlog.get_logger()
 
+CORRELATION_HEADER = b"x-correlation-id"
+_DEADLINE_HEADER = DEADLINE_HEADER.lower().encode("latin-1")
+_TIMEOUT_HEADER = TIMEOUT_HEADER.lower().encode("latin-1")
+
 
-class CorrelationIdMiddleware(BaseHTTPMiddleware):
-    """Middleware to handle correlation IDs for request tracking."""
+class CorrelationIdMiddleware:
+    """Middleware to handle correlation IDs for request tracking.
+    
+    Pure ASGI: the ID is read from the raw request headers and appended to
+    the ``http.response.start`` message, so responses (including streaming
+    ones) pass through without extra tasks or body copies.
+    
+    The request's time budget is read from ``X-Request-Deadline`` (Unix
+    timestamp) or ``X-Request-Timeout`` (seconds) into the deadline context
+    variable used by database sessions and outbound HTTP helpers. Requests
+    that arrive past their deadline are rejected, and handlers still running
+    at the deadline are cancelled; both get a 504 ``ErrorResponse``.
+    """
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        # Get or generate correlation ID
-        correlation_id = request.headers.get("X-Correlation-ID")
+    def __init__(
+        self,
+        app: ASGIApp,
+        default_timeout: Optional[float] = None,
+        max_timeout: Optional[float] = None
+    ):
+        """Initialize correlation middleware.
+        
+        Args:
+            app: ASGI application
+            default_timeout: Time budget (seconds) for requests without one
+            max_timeout: Upper bound for client-supplied budgets
+        """
+        self.app = app
+        self.default_timeout = default_timeout
+        self.max_timeout = max_timeout
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        # Get or generate correlation ID, and read the time budget
+        correlation_id = None
+        deadline = timeout = None
+        for name, value in scope["headers"]:
+            if name == CORRELATION_HEADER:
+                correlation_id = value.decode("latin-1")
+            elif name == _DEADLINE_HEADER:
+                deadline = value.decode("latin-1")
+            elif name == _TIMEOUT_HEADER:
+                timeout = value.decode("latin-1")
         if not correlation_id:
             correlation_id = str(uuid.uuid4())
         
         # Add to request state
-        request.state.correlation_id = correlation_id
+        scope.setdefault("state", {})["correlation_id"] = correlation_id
         
         # Bind to logger context
-        structlog.contextvars.bind_contextvars(
+        tokens = structlog.contextvars.bind_contextvars(
             correlation_id=correlation_id,
-            path=request.url.path,
-            method=request.method
+            path=scope["path"],
+            method=scope["method"]
         )
         
-        # Process request
-        response = await call_next(request)
+        header = (CORRELATION_HEADER, correlation_id.encode("latin-1"))
+        response_started = False
         
-        # Add correlation ID to response headers
-        response.headers["X-Correlation-ID"] = correlation_id
+        async def send_with_correlation_id(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+                # Add correlation ID to response headers
+                message["headers"] = [*message.get("headers", ()), header]
+            await send(message)
         
-        # Clear context
-        structlog.contextvars.clear_contextvars()
+        budget = parse_deadline(deadline, timeout, self.max_timeout)
+        if budget is None:
+            budget = self.default_timeout
+        deadline_token = set_deadline(budget)
         
-        return response
\ No newline at end of file
+        try:
+            if budget is None:
+                await self.app(scope, receive, send_with_correlation_id)
+            elif budget <= 0:
+                await self._deadline_exceeded(scope, receive, send_with_correlation_id)
+            else:
+                deadline_timeout = asyncio.timeout(budget)
+                try:
+                    async with deadline_timeout:
+                        await self.app(scope, receive, send_with_correlation_id)
+                except TimeoutError:
+                    if response_started or not deadline_timeout.expired():
+                        raise
+                    await self._deadline_exceeded(scope, receive, send_with_correlation_id)
+        finally:
+            # Restore previous context
+            reset_deadline(deadline_token)
+            structlog.contextvars.reset_contextvars(**tokens)
+    
+    @staticmethod
+    async def _deadline_exceeded(scope: Scope, receive: Receive, send: Send) -> None:
+        logger.warning("Request deadline exceeded")
+        response = build_error_response(
+            DeadlineExceededException(),
+            request_id=scope["state"]["correlation_id"],
+            path=scope["path"],
+            method=scope["method"]
+        )
+        await response(scope, receive, send)
@@ -1,71 +1,132 @@
 """Global error handler middleware."""
 
-from typing import Callable
+from typing import Callable, Optional
 from fastapi import Request, Response
-from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import structlog
-import traceback
 
 from spool_shared.exceptions import SpoolException
 from spool_shared.schemas.common import ErrorResponse
+from spool_shared.schemas.serialization import ModelJSONResponse
+
+from .error_reporting import get_error_reporter
 
 logger = structlog.get_logger()
 
 
-async def error_handler_middleware(request: Request, call_next: Callable) -> Response:
-    """Global error handler for consistent error responses."""
-    try:
-        return await call_next(request)
-        
-    except SpoolException as e:
+def build_error_response(
+    exc: Exception,
+    request_id: Optional[str],
+    path: str,
+    method: str
+) -> Response:
+    """Build a consistent error response for an exception.
+
+    Args:
+        exc: Exception raised while handling the request
+        request_id: Correlation ID of the request
+        path: Request path
+        method: Request method
+
+    Returns:
+        JSON error response
+    """
+    if isinstance(exc, SpoolException):
         # Handle custom Spool exceptions
         error_response = ErrorResponse(
-            error=e.error_code,
-            detail=e.detail,
-            status_code=e.status_code,
-            request_id=getattr(request.state, "correlation_id", None)
+            error=exc.error_code,
+            detail=exc.detail,
+            status_code=exc.status_code,
+            request_id=request_id
         )
-        
-        return JSONResponse(
-            status_code=e.status_code,
-            content=error_response.model_dump(),
-            headers=e.headers
+
+        return ModelJSONResponse(
+            status_code=exc.status_code,
+            content=error_response,
+            headers=exc.headers
         )
-        
-    except ValueError as e:
+
+    if isinstance(exc, ValueError):
         # Handle validation errors
         error_response = ErrorResponse(
             error="VALIDATION_ERROR",
-            detail=str(e),
+            detail=str(exc),
             status_code=422,
-            request_id=getattr(request.state, "correlation_id", None)
+            request_id=request_id
         )
-        
-        return JSONResponse(
+
+        return ModelJSONResponse(
             status_code=422,
-            content=error_response.model_dump()
+            content=error_response
         )
-        
+
+    # Handle unexpected errors (full tracebacks are rate limited per fingerprint)
+    get_error_reporter().report(exc, path=path, method=method)
+
+    error_response = ErrorResponse(
+        error="INTERNAL_SERVER_ERROR",
+        detail="An unexpected error occurred",
+        status_code=500,
+        request_id=request_id
+    )
+
+    return ModelJSONResponse(
+        status_code=500,
+        content=error_response
+    )
+
+
+class ErrorHandlerMiddleware:
+    """Pure ASGI global error handler for consistent error responses.
+
+    Equivalent to ``error_handler_middleware`` without the
+    ``BaseHTTPMiddleware`` task and body-stream overhead. Exceptions raised
+    after the response has started are re-raised unchanged.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_tracking_start(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_tracking_start)
+        except Exception as e:
+            if response_started:
+                raise
+
+            response = build_error_response(
+                e,
+                request_id=scope.get("state", {}).get("correlation_id"),
+                path=scope["path"],
+                method=scope["method"]
+            )
+            await response(scope, receive, send)
+
+
+async def error_handler_middleware(request: Request, call_next: Callable) -> Response:
+    """Global error handler for consistent error responses.
+
+    Prefer ``ErrorHandlerMiddleware``; this function form is kept for
+    services registering it with ``app.middleware("http")``.
+    """
+    try:
+        return await call_next(request)
     except Exception as e:
-        # Handle unexpected errors
-        logger.error(
-            "Unhandled exception",
-            error=str(e),
-            error_type=type(e).__name__,
-            traceback=traceback.format_exc(),
+        return build_error_response(
+            e,
+            request_id=getattr(request.state, "correlation_id", None),
             path=request.url.path,
             method=request.method
         )
-        
-        error_response = ErrorResponse(
-            error="INTERNAL_SERVER_ERROR",
-            detail="An unexpected error occurred",
-            status_code=500,
-            request_id=getattr(request.state, "correlation_id", None)
-        )
-        
-        return JSONResponse(
-            status_code=500,
-            content=error_response.model_dump()
-        )
\ No newline at end of file
@@ -0,0 +1,256 @@
+"""Fingerprinted, rate-limited logging of unhandled exceptions."""
+
+import hashlib
+import threading
+import time
+import traceback
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import structlog
+
+from .metrics import MetricsRegistry, get_metrics_registry
+
+logger = structlog.get_logger()
+
+
+def fingerprint_exception(exc: BaseException, depth: int = 5) -> str:
+    """Fingerprint an exception by type and innermost stack frames.
+
+    Line numbers are included, so the same error raised from different
+    places gets different fingerprints. Messages are not, so errors that
+    differ only in the IDs they mention are grouped.
+
+    Args:
+        exc: Exception to fingerprint
+        depth: Number of innermost frames to include
+
+    Returns:
+        16-character hex fingerprint
+    """
+    frames: List[str] = []
+    tb = exc.__traceback__
+    while tb is not None:
+        code = tb.tb_frame.f_code
+        frames.append(f"{code.co_filename}:{code.co_name}:{tb.tb_lineno}")
+        tb = tb.tb_next
+    exc_type = type(exc)
+    parts = [f"{exc_type.__module__}.{exc_type.__qualname__}", *frames[-depth:]]
+    return hashlib.blake2b("|".join(parts).encode(), digest_size=8).hexdigest()
+
+
+class _Fingerprint:
+    """Counters for one exception fingerprint."""
+
+    __slots__ = ("error_type", "location", "total", "window_start", "in_window", "suppressed")
+
+    def __init__(self, error_type: str, location: str, now: float):
+        self.error_type = error_type
+        self.location = location
+        self.total = 0
+        self.window_start = now
+        self.in_window = 0
+        self.suppressed = 0
+
+
+class ErrorReporter:
+    """Log unhandled exceptions without letting error storms burn CPU.
+
+    The first ``full_traces_per_window`` occurrences of a fingerprint in
+    each window are logged with a full traceback. Later ones only update
+    counters, and a single summary record with the suppressed count is
+    logged once the window ends: by the next report of any exception, or
+    by a daemon thread started on the first suppression if none comes.
+    Totals per fingerprint are kept for ``stats()``. The metrics registry
+    counts exceptions by type only, so its series stay bounded;
+    fingerprints appear in logs.
+    """
+
+    def __init__(
+        self,
+        window_seconds: float = 60.0,
+        full_traces_per_window: int = 5,
+        depth: int = 5,
+        max_fingerprints: int = 1000,
+        registry: Optional[MetricsRegistry] = None
+    ):
+        """Initialize error reporter.
+
+        Args:
+            window_seconds: Length of a rate-limiting window
+            full_traces_per_window: Full tracebacks logged per fingerprint per window
+            depth: Innermost stack frames included in fingerprints
+            max_fingerprints: Fingerprints tracked before the least recent is dropped
+            registry: Metrics registry (default: global registry)
+        """
+        self.window_seconds = window_seconds
+        self.full_traces_per_window = full_traces_per_window
+        self.depth = depth
+        self.max_fingerprints = max_fingerprints
+        self.registry = registry or get_metrics_registry()
+        self.registry.describe("unhandled_exceptions_total", "Unhandled exceptions by type")
+        self._fingerprints: "OrderedDict[str, _Fingerprint]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._next_sweep = 0.0
+        self._flusher: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def report(self, exc: BaseException, **fields: Any) -> str:
+        """Record an unhandled exception and log it if within the limit.
+
+        Args:
+            exc: Exception to report
+            **fields: Extra log fields (path, method, ...)
+
+        Returns:
+            Exception fingerprint
+        """
+        fingerprint = fingerprint_exception(exc, self.depth)
+        error_type = type(exc).__name__
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._fingerprints.get(fingerprint)
+            if entry is None:
+                entry = self._fingerprints[fingerprint] = _Fingerprint(
+                    error_type, _location(exc), now
+                )
+                if len(self._fingerprints) > self.max_fingerprints:
+                    self._fingerprints.popitem(last=False)
+            else:
+                self._fingerprints.move_to_end(fingerprint)
+
+            expired = self._sweep(now) if now >= self._next_sweep else []
+            if now - entry.window_start >= self.window_seconds:
+                if entry.suppressed:
+                    expired.append((fingerprint, entry, entry.suppressed))
+                entry.window_start = now
+                entry.in_window = 0
+                entry.suppressed = 0
+
+            entry.total += 1
+            entry.in_window += 1
+            log_full = entry.in_window <= self.full_traces_per_window
+            if not log_full:
+                entry.suppressed += 1
+                if self._flusher is None:
+                    self._start_flusher()
+
+        self.registry.inc("unhandled_exceptions_total", error_type=error_type)
+        self._log_suppressed(expired)
+
+        if log_full:
+            logger.error(
+                "Unhandled exception",
+                error=str(exc),
+                error_type=error_type,
+                fingerprint=fingerprint,
+                traceback="".join(traceback.format_exception(exc)),
+                **fields
+            )
+
+        return fingerprint
+
+    def flush(self, force: bool = False) -> None:
+        """Log the suppressed counts of windows that have ended.
+
+        Args:
+            force: Also log counts of windows still open (e.g. at shutdown)
+        """
+        now = time.monotonic()
+        with self._lock:
+            if force:
+                expired = []
+                for fingerprint, entry in self._fingerprints.items():
+                    if entry.suppressed:
+                        expired.append((fingerprint, entry, entry.suppressed))
+                        entry.suppressed = 0
+            else:
+                expired = self._sweep(now)
+        self._log_suppressed(expired)
+
+    def close(self) -> None:
+        """Stop the flusher thread and log all pending suppressed counts."""
+        self._stopped.set()
+        self.flush(force=True)
+
+    def _sweep(self, now: float) -> List[Tuple[str, _Fingerprint, int]]:
+        """Close ended windows with suppressed counts (lock held)."""
+        self._next_sweep = now + min(1.0, self.window_seconds)
+        expired = []
+        for fingerprint, entry in self._fingerprints.items():
+            if entry.suppressed and now - entry.window_start >= self.window_seconds:
+                expired.append((fingerprint, entry, entry.suppressed))
+                entry.window_start = now
+                entry.in_window = 0
+                entry.suppressed = 0
+        return expired
+
+    def _log_suppressed(self, expired: List[Tuple[str, _Fingerprint, int]]) -> None:
+        for fingerprint, entry, suppressed in expired:
+            logger.error(
+                "Unhandled exception repeated",
+                fingerprint=fingerprint,
+                error_type=entry.error_type,
+                location=entry.location,
+                suppressed=suppressed,
+                window_seconds=self.window_seconds
+            )
+
+    def _start_flusher(self) -> None:
+        """Start the daemon thread that flushes ended windows (lock held)."""
+        def run() -> None:
+            while not self._stopped.wait(self.window_seconds):
+                self.flush()
+
+        self._flusher = threading.Thread(target=run, name="error-reporter-flush", daemon=True)
+        self._flusher.start()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get counters per fingerprint."""
+        with self._lock:
+            return {
+                fingerprint: {
+                    "error_type": entry.error_type,
+                    "location": entry.location,
+                    "total": entry.total,
+                    "in_window": entry.in_window,
+                    "suppressed": entry.suppressed,
+                }
+                for fingerprint, entry in self._fingerprints.items()
+            }
+
+
+def _location(exc: BaseException) -> str:
+    """Get ``file:function:line`` of the innermost frame."""
+    tb = exc.__traceback__
+    if tb is None:
+        return "unknown"
+    while tb.tb_next is not None:
+        tb = tb.tb_next
+    code = tb.tb_frame.f_code
+    return f"{code.co_filename}:{code.co_name}:{tb.tb_lineno}"
+
+
+# Global error reporter instance
+_error_reporter = ErrorReporter()
+
+
+def init_error_reporter(**kwargs) -> ErrorReporter:
+    """Replace the global error reporter.
+
+    Args:
+        **kwargs: Error reporter configuration
+
+    Returns:
+        Error reporter
+    """
+    global _error_reporter
+    _error_reporter.close()
+    _error_reporter = ErrorReporter(**kwargs)
+    return _error_reporter
+
+
+def get_error_reporter() -> ErrorReporter:
+    """Get global error reporter."""
+    return _error_reporter
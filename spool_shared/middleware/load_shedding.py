@@ -0,0 +1,198 @@
+"""Adaptive concurrency limiting and load shedding middleware."""
+
+import math
+import time
+from typing import Dict, Optional
+
+import structlog
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from spool_shared.exceptions import RateLimitException
+
+from .error_handler import build_error_response
+from .metrics import MetricsRegistry, get_metrics_registry
+
+logger = structlog.get_logger()
+
+# Share of the concurrency limit each priority class may occupy. Lower
+# priorities are shed first; critical routes may exceed the limit slightly
+# so health checks and logins still get through at saturation.
+PRIORITY_SHARES: Dict[str, float] = {
+    "critical": 1.25,
+    "normal": 1.0,
+    "low": 0.75,
+}
+
+
+class AdaptiveConcurrencyLimiter:
+    """Concurrency limit adjusted from observed latency (gradient method).
+
+    A slow moving average of latency serves as the no-load baseline and a
+    fast one tracks current latency. When current latency rises above
+    ``baseline * tolerance`` the limit shrinks in proportion; otherwise it
+    grows by a small queue allowance of ``sqrt(limit)``. The limit only
+    grows while at least half of it is in use, so a lightly loaded service
+    does not drift up to ``max_limit`` and then admit a whole burst.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 50,
+        min_limit: int = 5,
+        max_limit: int = 500,
+        tolerance: float = 1.5,
+        smoothing: float = 0.2,
+        short_window: int = 10,
+        long_window: int = 600
+    ):
+        """Initialize limiter.
+
+        Args:
+            initial_limit: Starting concurrency limit
+            min_limit: Lowest allowed limit
+            max_limit: Highest allowed limit
+            tolerance: Latency increase over baseline tolerated before shrinking
+            smoothing: Weight of each new limit estimate (0.0-1.0)
+            short_window: Samples in the fast latency average
+            long_window: Samples in the slow (baseline) latency average
+        """
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.tolerance = tolerance
+        self.smoothing = smoothing
+        self._short_alpha = 2 / (short_window + 1)
+        self._long_alpha = 2 / (long_window + 1)
+        self.short_rtt = 0.0
+        self.long_rtt = 0.0
+        self.in_flight = 0
+
+    def try_acquire(self, share: float = 1.0) -> bool:
+        """Admit a request if its priority's share of the limit allows."""
+        if self.in_flight >= self.limit * share:
+            return False
+        self.in_flight += 1
+        return True
+
+    def release(self, latency: Optional[float] = None) -> None:
+        """Record a finished request and update the limit.
+
+        Args:
+            latency: Request latency in seconds (None to skip sampling)
+        """
+        in_flight = self.in_flight
+        self.in_flight -= 1
+        if latency is None:
+            return
+
+        if self.long_rtt == 0.0:
+            self.short_rtt = self.long_rtt = latency
+            return
+
+        self.short_rtt += self._short_alpha * (latency - self.short_rtt)
+        self.long_rtt += self._long_alpha * (latency - self.long_rtt)
+
+        # Let the baseline recover quickly when latency improves
+        if self.long_rtt > self.short_rtt * 2:
+            self.long_rtt = self.short_rtt
+
+        gradient = max(0.5, min(1.0, self.tolerance * self.long_rtt / self.short_rtt))
+        if gradient == 1.0 and in_flight < self.limit / 2:
+            # App-limited: low load says nothing about spare capacity
+            return
+        estimate = self.limit * gradient + math.sqrt(self.limit)
+        limit = self.limit * (1 - self.smoothing) + estimate * self.smoothing
+        self.limit = max(self.min_limit, min(self.max_limit, limit))
+
+    def retry_after(self) -> int:
+        """Estimate seconds until capacity frees up."""
+        if self.limit <= 0:
+            return 1
+        return max(1, math.ceil(self.short_rtt * self.in_flight / self.limit))
+
+
+class LoadSheddingMiddleware:
+    """Shed requests beyond an adaptive concurrency limit.
+
+    Routes are assigned priority classes by path prefix (``critical``,
+    ``normal``, ``low``); lower classes are rejected first. Only
+    non-critical requests feed latency samples to the limiter. Shed requests
+    get a 429 ``ErrorResponse`` with a computed ``Retry-After``. The current
+    limit, in-flight count and shed counts are published to the metrics
+    registry.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        route_priorities: Optional[Dict[str, str]] = None,
+        default_priority: str = "normal",
+        registry: Optional[MetricsRegistry] = None
+    ):
+        """Initialize load shedding middleware.
+
+        Args:
+            app: ASGI application
+            limiter: Concurrency limiter (default: AdaptiveConcurrencyLimiter())
+            route_priorities: Path prefix to priority class; ``/health`` and
+                ``/auth/login`` are critical unless overridden
+            default_priority: Priority for unlisted routes
+            registry: Metrics registry (default: global registry)
+        """
+        self.app = app
+        self.limiter = limiter or AdaptiveConcurrencyLimiter()
+        priorities = {"/health": "critical", "/auth/login": "critical", **(route_priorities or {})}
+        self.route_priorities = sorted(priorities.items(), key=lambda item: len(item[0]), reverse=True)
+        self.default_priority = default_priority
+        self.registry = registry or get_metrics_registry()
+        self.registry.describe("concurrency_limit", "Adaptive concurrency limit")
+        self.registry.describe("load_shed_total", "Requests rejected by load shedding")
+
+    def _priority(self, path: str) -> str:
+        for prefix, priority in self.route_priorities:
+            if path.startswith(prefix):
+                return priority
+        return self.default_priority
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        limiter = self.limiter
+        priority = self._priority(scope["path"])
+
+        if not limiter.try_acquire(PRIORITY_SHARES.get(priority, 1.0)):
+            self.registry.inc("load_shed_total", priority=priority)
+            response = build_error_response(
+                RateLimitException(
+                    detail="Service overloaded, retry later",
+                    retry_after=limiter.retry_after()
+                ),
+                request_id=scope.get("state", {}).get("correlation_id"),
+                path=scope["path"],
+                method=scope["method"]
+            )
+            await response(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            # Critical routes (health checks) are too cheap to be
+            # representative latency samples
+            limiter.release(
+                None if priority == "critical" else time.perf_counter() - start_time
+            )
+            self.registry.set_gauge("concurrency_limit", round(limiter.limit, 1))
+
+    def stats(self) -> Dict[str, float]:
+        """Get limiter state."""
+        return {
+            "limit": self.limiter.limit,
+            "in_flight": self.limiter.in_flight,
+            "short_rtt": self.limiter.short_rtt,
+            "long_rtt": self.limiter.long_rtt,
+        }
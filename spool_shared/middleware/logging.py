@@ -1,63 +1,250 @@
 """Request/response logging middleware."""
 
+import atexit
+import queue
+import random
+import threading
 import time
-from typing import Callable
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from typing import Any, Dict, List, Optional, Tuple
+from starlette.datastructures import QueryParams
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import structlog
 
+from spool_shared.utils.request_stats import (
+    RequestStats, get_request_stats, reset_request_stats, start_request_stats
+)
+
 logger = structlog.get_logger()
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware for logging requests and responses."""
+# Queued record: (level method name, event, fields)
+_LogRecord = Tuple[str, str, Dict[str, Any]]
+
+
+class QueuedLogWriter:
+    """Bounded queue that renders and writes log records off the event loop.
+
+    Records are enqueued with their structlog context already merged, and a
+    daemon thread drains them in batches. When the queue is full new records
+    are dropped and counted instead of blocking the request.
+    """
+
+    def __init__(
+        self,
+        max_queue: int = 10000,
+        batch_size: int = 256,
+        flush_interval: float = 0.5,
+        log: Optional[Any] = None
+    ):
+        """Initialize log writer.
+
+        Args:
+            max_queue: Maximum queued records before dropping
+            batch_size: Maximum records written per batch
+            flush_interval: Seconds to wait for more records before writing
+            log: structlog logger to write through (default: module logger)
+        """
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self.written = 0
+        self._log = log or logger
+        self._queue: "queue.Queue[Optional[_LogRecord]]" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def submit(self, level: str, event: str, **fields: Any) -> None:
+        """Queue a log record.
+
+        Args:
+            level: Log level method name (``info``, ``warning``, ...)
+            event: Log event message
+            **fields: Log fields
+        """
+        if self._thread is None:
+            self._start()
+
+        # Capture request context now; the writer thread has its own
+        record = {**structlog.contextvars.get_contextvars(), **fields}
+        try:
+            self._queue.put_nowait((level, event, record))
+        except queue.Full:
+            self.dropped += 1
+
+    def _start(self) -> None:
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch: List[_LogRecord] = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._write(batch)
+                    return
+                batch.append(item)
+            self._write(batch)
+
+    def _write(self, batch: List[_LogRecord]) -> None:
+        for level, event, record in batch:
+            try:
+                getattr(self._log, level)(event, **record)
+            except Exception:
+                self.dropped += 1
+            else:
+                self.written += 1
+
+    def close(self) -> None:
+        """Flush queued records and stop the writer thread."""
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        self._queue.put(None)
+        thread.join(timeout=5)
+
+    def stats(self) -> Dict[str, int]:
+        """Get writer counters."""
+        return {
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "dropped": self.dropped,
+        }
+
+
+class LoggingMiddleware:
+    """Middleware for logging requests and responses.
+
+    Pure ASGI: the ``X-Process-Time`` header is added to the
+    ``http.response.start`` message and the response body is never
+    buffered. Each request produces at most one "Request completed" (or
+    "Request failed") record.
+
+    Sampling: a request is logged if it was head-sampled (with probability
+    ``sample_rate``), or its status is at least ``error_status``, or it took
+    at least ``slow_threshold`` seconds. Failed requests are always logged.
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    Fields other layers add to the request's ``RequestStats`` (e.g. database
+    time) are included in the record.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        sample_rate: float = 1.0,
+        slow_threshold: float = 1.0,
+        error_status: int = 400,
+        writer: Optional[QueuedLogWriter] = None
+    ):
+        """Initialize logging middleware.
+
+        Args:
+            app: ASGI application
+            sample_rate: Fraction of other requests to log (0.0-1.0)
+            slow_threshold: Requests at least this slow (seconds) are always logged
+            error_status: Responses with at least this status are always logged
+            writer: Optional queued writer to log off the event loop
+        """
+        self.app = app
+        self.sample_rate = sample_rate
+        self.slow_threshold = slow_threshold
+        self.error_status = error_status
+        self.writer = writer
+
+    def _emit(self, level: str, event: str, **fields: Any) -> None:
+        if self.writer is not None:
+            self.writer.submit(level, event, **fields)
+        else:
+            getattr(logger, level)(event, **fields)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         # Start timer
-        start_time = time.time()
-        
-        # Log request
-        logger.info(
-            "Request started",
-            method=request.method,
-            path=request.url.path,
-            query_params=dict(request.query_params),
-            client_host=request.client.host if request.client else None
-        )
-        
+        start_time = time.perf_counter()
+        sampled = self.sample_rate >= 1.0 or random.random() < self.sample_rate
+        status_code = None
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Add timing header
+                duration = time.perf_counter() - start_time
+                message["headers"] = [
+                    *message.get("headers", ()),
+                    (b"x-process-time", str(round(duration, 3)).encode("latin-1"))
+                ]
+            await send(message)
+
+        stats_token = start_request_stats()
+        stats = get_request_stats()
         try:
             # Process request
-            response = await call_next(request)
-            
-            # Calculate duration
-            duration = time.time() - start_time
-            
-            # Log response
-            logger.info(
-                "Request completed",
-                status_code=response.status_code,
-                duration_seconds=round(duration, 3),
-                method=request.method,
-                path=request.url.path
-            )
-            
-            # Add timing header
-            response.headers["X-Process-Time"] = str(round(duration, 3))
-            
-            return response
-            
+            await self.app(scope, receive, send_with_timing)
+
         except Exception as e:
             # Calculate duration
-            duration = time.time() - start_time
-            
+            duration = time.perf_counter() - start_time
+
             # Log error
-            logger.error(
+            self._emit(
+                "error",
                 "Request failed",
                 error=str(e),
                 error_type=type(e).__name__,
                 duration_seconds=round(duration, 3),
-                method=request.method,
-                path=request.url.path
+                **self._request_fields(scope),
+                **self._finish_stats(stats, scope)
+            )
+
+            raise
+
+        finally:
+            reset_request_stats(stats_token)
+
+        # Calculate duration
+        duration = time.perf_counter() - start_time
+        stats_fields = self._finish_stats(stats, scope)
+
+        if sampled or duration >= self.slow_threshold or \
+                (status_code or 500) >= self.error_status:
+            # Log combined request/response record
+            self._emit(
+                "info",
+                "Request completed",
+                status_code=status_code,
+                duration_seconds=round(duration, 3),
+                **self._request_fields(scope),
+                **stats_fields
             )
-            
-            raise
\ No newline at end of file
+
+    @staticmethod
+    def _finish_stats(stats: RequestStats, scope: Scope) -> Dict[str, Any]:
+        route = scope.get("route")
+        stats.route = getattr(route, "path", None) or "unmatched"
+        return stats.finish()
+
+    @staticmethod
+    def _request_fields(scope: Scope) -> Dict[str, Any]:
+        client = scope.get("client")
+        return {
+            "method": scope["method"],
+            "path": scope["path"],
+            "query_params": dict(QueryParams(scope.get("query_string", b""))),
+            "client_host": client[0] if client else None,
+        }
@@ -0,0 +1,80 @@
+"""Request metrics middleware.
+
+The registry lives in ``spool_shared.utils.metrics`` so that non-HTTP
+layers (e.g. the database package) can record metrics without importing
+the middleware package; it is re-exported here.
+"""
+
+import time
+from typing import Optional
+
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from spool_shared.utils.metrics import (  # noqa: F401 (re-exported)
+    EXPOSITION_BUCKETS, LatencyHistogram, MetricsRegistry, get_metrics_registry
+)
+
+
+class MetricsMiddleware:
+    """Record request latency, in-flight requests and errors.
+
+    Latency histograms are keyed by method, route template (e.g.
+    ``/items/{item_id}``) and status class, so path parameters do not
+    create new series. Unmatched paths are grouped under ``unmatched``.
+    """
+
+    def __init__(self, app: ASGIApp, registry: Optional[MetricsRegistry] = None):
+        self.app = app
+        self.registry = registry or get_metrics_registry()
+        self.registry.describe("http_request_duration_seconds", "HTTP request latency")
+        self.registry.describe("http_requests_in_flight", "HTTP requests being processed")
+        self.registry.describe("http_request_errors_total", "HTTP requests failing with 5xx or an exception")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        registry = self.registry
+        start_time = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        registry.add_gauge("http_requests_in_flight", 1)
+        try:
+            await self.app(scope, receive, send_with_status)
+        except Exception:
+            status_code = 500
+            raise
+        finally:
+            registry.add_gauge("http_requests_in_flight", -1)
+            route = scope.get("route")
+            template = getattr(route, "path", None) or "unmatched"
+            registry.observe(
+                "http_request_duration_seconds",
+                time.perf_counter() - start_time,
+                method=scope["method"],
+                route=template,
+                status=f"{status_code // 100}xx"
+            )
+            if status_code >= 500:
+                registry.inc("http_request_errors_total", method=scope["method"], route=template)
+
+
+async def metrics_endpoint(request: Request) -> Response:
+    """Expose the global registry in Prometheus text format.
+
+    Usage:
+        app.add_route("/metrics", metrics_endpoint, include_in_schema=False)
+    """
+    return Response(
+        get_metrics_registry().render_prometheus(),
+        media_type="text/plain; version=0.0.4"
+    )
@@ -0,0 +1,316 @@
+"""Rate limiting middleware."""
+
+import math
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+import structlog
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from spool_shared.auth.jwks import get_jwks_store
+from spool_shared.auth.jwt_utils import verify_token_async
+from spool_shared.auth.permissions import Principal
+from spool_shared.constants.limits import RateLimits
+from spool_shared.exceptions import RateLimitException
+
+from .error_handler import build_error_response
+from .metrics import get_metrics_registry
+
+if TYPE_CHECKING:
+    from spool_shared.utils.shared_counters import SharedCounterTable
+
+logger = structlog.get_logger()
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """Allowed requests per window (a limit of 0 denies every request)."""
+    limit: int
+    window: float  # seconds
+
+    def __post_init__(self):
+        if self.limit < 0:
+            raise ValueError("limit must not be negative")
+        if self.window <= 0:
+            raise ValueError("window must be positive")
+
+
+# Limits per tier / endpoint class, from constants.limits.RateLimits
+DEFAULT_RATE_LIMITS: Dict[str, RateLimit] = {
+    "anonymous": RateLimit(RateLimits.DEFAULT, RateLimits.WINDOW_DEFAULT),
+    "authenticated": RateLimit(RateLimits.AUTHENTICATED, RateLimits.WINDOW_DEFAULT),
+    "premium": RateLimit(RateLimits.PREMIUM, RateLimits.WINDOW_DEFAULT),
+    "login": RateLimit(RateLimits.LOGIN_ATTEMPTS, RateLimits.WINDOW_LOGIN),
+    "password_reset": RateLimit(RateLimits.PASSWORD_RESET, RateLimits.WINDOW_RESET),
+    "file_upload": RateLimit(RateLimits.FILE_UPLOAD, RateLimits.WINDOW_DEFAULT),
+}
+
+
+class RateLimitBackend(ABC):
+    """Storage for rate limit state.
+
+    Implement this to share limits through an external store.
+    """
+
+    @abstractmethod
+    async def hit(self, key: str, rate: RateLimit) -> Tuple[bool, float]:
+        """Consume one request for a key.
+
+        Args:
+            key: Limiter key (identity and endpoint class)
+            rate: Limit to enforce
+
+        Returns:
+            Tuple of (allowed, seconds until a request would be allowed)
+        """
+
+    async def refund(self, key: str, rate: RateLimit) -> None:
+        """Return a request consumed by an allowed ``hit``.
+
+        Called when another limit rejects the same request, so rejected
+        requests do not drain the buckets that allowed them. Backends that
+        cannot refund may leave this as a no-op.
+
+        Args:
+            key: Limiter key passed to ``hit``
+            rate: Limit passed to ``hit``
+        """
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """In-process token buckets in lock-striped shards.
+
+    Each key holds a bucket of ``limit`` tokens refilled at
+    ``limit / window`` per second. Buckets idle long enough to be full
+    again are swept one shard at a time every ``cleanup_interval`` seconds.
+    """
+
+    def __init__(self, shards: int = 64, cleanup_interval: float = 10.0):
+        """Initialize backend.
+
+        Args:
+            shards: Number of independently locked shards
+            cleanup_interval: Seconds between idle-key sweeps of one shard
+        """
+        self._shards: List[Dict[str, List[float]]] = [{} for _ in range(shards)]
+        self._locks = [threading.Lock() for _ in range(shards)]
+        self.cleanup_interval = cleanup_interval
+        self._next_cleanup = time.monotonic() + cleanup_interval
+        self._cleanup_shard = 0
+
+    def take(self, key: str, rate: RateLimit) -> Tuple[bool, float]:
+        """Synchronous form of ``hit``."""
+        if rate.limit == 0:
+            return False, rate.window
+
+        now = time.monotonic()
+        index = zlib.crc32(key.encode()) % len(self._shards)
+        refill = rate.limit / rate.window
+
+        with self._locks[index]:
+            shard = self._shards[index]
+            bucket = shard.get(key)
+            if bucket is None:
+                # [tokens, last update, seconds until full]
+                bucket = shard[key] = [float(rate.limit), now, rate.window]
+            else:
+                bucket[0] = min(rate.limit, bucket[0] + (now - bucket[1]) * refill)
+                bucket[1] = now
+
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                allowed, retry_after = True, 0.0
+            else:
+                allowed, retry_after = False, (1 - bucket[0]) / refill
+
+        if now >= self._next_cleanup:
+            self._cleanup(now)
+
+        return allowed, retry_after
+
+    async def hit(self, key: str, rate: RateLimit) -> Tuple[bool, float]:
+        return self.take(key, rate)
+
+    async def refund(self, key: str, rate: RateLimit) -> None:
+        index = zlib.crc32(key.encode()) % len(self._shards)
+        with self._locks[index]:
+            bucket = self._shards[index].get(key)
+            if bucket is not None:
+                bucket[0] = min(rate.limit, bucket[0] + 1)
+
+    def _cleanup(self, now: float) -> None:
+        self._next_cleanup = now + self.cleanup_interval
+        index = self._cleanup_shard
+        self._cleanup_shard = (index + 1) % len(self._shards)
+
+        with self._locks[index]:
+            shard = self._shards[index]
+            idle = [key for key, bucket in shard.items() if now - bucket[1] >= bucket[2]]
+            for key in idle:
+                del shard[key]
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+
+class SharedMemoryRateLimitBackend(RateLimitBackend):
+    """Token buckets in a ``SharedCounterTable``, shared by all workers on a host."""
+
+    def __init__(self, table: Optional["SharedCounterTable"] = None):
+        """Initialize backend.
+
+        Args:
+            table: Shared counter table (default: the ``spool-counters`` table)
+        """
+        if table is None:
+            from spool_shared.utils.shared_counters import SharedCounterTable
+            table = SharedCounterTable()
+        self.table = table
+
+    async def hit(self, key: str, rate: RateLimit) -> Tuple[bool, float]:
+        return await self.table.take_token_async(key, rate.limit, rate.window)
+
+    async def refund(self, key: str, rate: RateLimit) -> None:
+        await self.table.refund_token_async(key, rate.limit, rate.window)
+
+
+class RateLimitMiddleware:
+    """Enforce ``RateLimits`` per principal (or client IP) and endpoint class.
+
+    Every request counts against its tier limit (``anonymous``,
+    ``authenticated`` or ``premium``); requests under a prefix listed in
+    ``route_classes`` also count against that class (e.g. ``login``).
+    Bearer tokens are verified through the shared (cached) verifier and the
+    resulting ``Principal`` is stored on ``request.state`` for
+    ``get_principal`` to reuse. Invalid tokens are limited as anonymous, as
+    are all tokens while no JWKS key store is initialized (see
+    ``init_jwks``): unverified claims never pick the identity or tier.
+
+    Rejected requests get a 429 ``ErrorResponse`` with ``Retry-After``,
+    and the tokens they took from limits that allowed them are refunded.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        backend: Optional[RateLimitBackend] = None,
+        limits: Optional[Dict[str, RateLimit]] = None,
+        route_classes: Optional[Dict[str, str]] = None,
+        exempt_paths: Sequence[str] = ("/health",),
+        premium_roles: Sequence[str] = ("premium",),
+        trusted_proxies: int = 0
+    ):
+        """Initialize rate limiting middleware.
+
+        Args:
+            app: ASGI application
+            backend: Rate limit state store (default: in-memory)
+            limits: Limits per tier / endpoint class
+            route_classes: Path prefix to endpoint class, e.g.
+                ``{"/auth/login": "login"}``
+            exempt_paths: Path prefixes that are never limited
+            premium_roles: Roles that get the ``premium`` tier
+            trusted_proxies: Number of reverse proxies in front of the app
+                that append to ``X-Forwarded-For``; the client IP is the
+                entry the outermost of them added. 0 ignores the header.
+        """
+        if trusted_proxies < 0:
+            raise ValueError("trusted_proxies must not be negative")
+        self.app = app
+        self.backend = backend or MemoryRateLimitBackend()
+        self.limits = {**DEFAULT_RATE_LIMITS, **(limits or {})}
+        self.route_classes = sorted(
+            (route_classes or {}).items(), key=lambda item: len(item[0]), reverse=True
+        )
+        self.exempt_paths = tuple(exempt_paths)
+        self.premium_roles = frozenset(premium_roles)
+        self.trusted_proxies = trusted_proxies
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(self.exempt_paths):
+            await self.app(scope, receive, send)
+            return
+
+        identity, tier = await self._identify(scope)
+        checks = [(f"{tier}:{identity}", self.limits[tier])]
+
+        path = scope["path"]
+        for prefix, endpoint_class in self.route_classes:
+            if path.startswith(prefix):
+                checks.append((f"{endpoint_class}:{identity}", self.limits[endpoint_class]))
+                break
+
+        allowed, retry_after = True, 0.0
+        consumed = []
+        for key, rate in checks:
+            allowed, retry_after = await self.backend.hit(key, rate)
+            if not allowed:
+                break
+            consumed.append((key, rate))
+
+        if not allowed:
+            for key, rate in consumed:
+                await self.backend.refund(key, rate)
+            get_metrics_registry().inc("rate_limited_total", tier=tier)
+            logger.debug("Rate limit exceeded", identity=identity, tier=tier, path=path)
+            response = build_error_response(
+                RateLimitException(retry_after=max(1, math.ceil(retry_after))),
+                request_id=scope.get("state", {}).get("correlation_id"),
+                path=path,
+                method=scope["method"]
+            )
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
+
+    async def _identify(self, scope: Scope) -> Tuple[str, str]:
+        """Get limiter identity and tier for a request."""
+        state = scope.setdefault("state", {})
+        principal = state.get("principal")
+
+        if principal is None and get_jwks_store() is not None:
+            token = _bearer_token(scope)
+            if token:
+                try:
+                    principal = Principal.from_claims(await verify_token_async(token))
+                    state["principal"] = principal
+                except Exception:
+                    principal = None
+
+        if principal is not None and principal.sub:
+            tier = "premium" if not self.premium_roles.isdisjoint(principal.roles) else "authenticated"
+            return f"user:{principal.sub}", tier
+
+        return f"ip:{self._client_ip(scope)}", "anonymous"
+
+    def _client_ip(self, scope: Scope) -> str:
+        """Get the client IP, trusting only hops added by our own proxies.
+
+        Entries left of the ones our proxies appended are client-supplied,
+        so the rightmost untrusted hop is used; with fewer entries than
+        proxies the header was not set by them and is ignored.
+        """
+        if self.trusted_proxies:
+            hops: List[str] = []
+            for name, value in scope["headers"]:
+                if name == b"x-forwarded-for":
+                    hops.extend(hop.strip() for hop in value.decode("latin-1").split(","))
+            if len(hops) >= self.trusted_proxies and hops[-self.trusted_proxies]:
+                return hops[-self.trusted_proxies]
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+
+def _bearer_token(scope: Scope) -> Optional[str]:
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, credentials = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer" and credentials:
+                return credentials
+            return None
+    return None
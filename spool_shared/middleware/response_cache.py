@@ -0,0 +1,443 @@
+"""HTTP response caching middleware with ETags and tag invalidation."""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .coalescing import _normalized_query, _principal_scope
+from .metrics import MetricsRegistry, get_metrics_registry
+
+CacheKey = Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class CacheRule:
+    """Caching policy for a route prefix."""
+    ttl: float  # seconds
+    per_principal: bool = True
+    tags: Tuple[str, ...] = ()
+
+
+@dataclass
+class CachedResponse:
+    """Rendered response stored in the cache."""
+    status: int
+    headers: List[Tuple[bytes, bytes]]
+    body: bytes
+    etag: bytes
+    stored_at: float
+    expires_at: float
+    tags: Tuple[str, ...]
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(name) + len(value) for name, value in self.headers)
+
+
+def compute_etag(body: bytes) -> bytes:
+    """Compute a strong ETag for a response body."""
+    return b'"' + hashlib.blake2b(body, digest_size=16).hexdigest().encode("ascii") + b'"'
+
+
+def etag_matches(if_none_match: bytes, etag: bytes) -> bool:
+    """Check an ``If-None-Match`` header value against an ETag."""
+    if if_none_match.strip() == b"*":
+        return True
+    for candidate in if_none_match.split(b","):
+        candidate = candidate.strip()
+        if candidate.startswith(b"W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def add_cache_tags(request: Request, *tags: str) -> None:
+    """Tag the response to a request for later invalidation.
+
+    Usage:
+        add_cache_tags(request, "leaderboard", f"user:{user_id}")
+    """
+    existing = getattr(request.state, "cache_tags", ())
+    request.state.cache_tags = (*existing, *tags)
+
+
+class ResponseCache:
+    """Memory-bounded LRU store of rendered responses.
+
+    Entries expire after their TTL and are evicted least recently used
+    first once the total size exceeds ``max_bytes``. Each entry can carry
+    tags; ``invalidate_tags`` drops every entry with any of the given tags.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, max_entry_bytes: int = 1024 * 1024):
+        """Initialize response cache.
+
+        Args:
+            max_bytes: Maximum total size of cached responses
+            max_entry_bytes: Largest response body that will be cached
+        """
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self._entries: "OrderedDict[CacheKey, CachedResponse]" = OrderedDict()
+        self._tags: Dict[str, Set[CacheKey]] = {}
+        self._lock = threading.Lock()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: CacheKey) -> Optional[CachedResponse]:
+        """Get a live entry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.expires_at <= time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: CacheKey, entry: CachedResponse) -> None:
+        """Store an entry, evicting least recently used ones if needed."""
+        size = entry.size
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self.size += size
+            for tag in entry.tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while self.size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _remove(self, key: CacheKey) -> None:
+        entry = self._entries.pop(key)
+        self.size -= entry.size
+        for tag in entry.tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def invalidate_tags(self, *tags: str) -> int:
+        """Drop all entries carrying any of the tags.
+
+        Returns:
+            Number of entries removed
+        """
+        removed = 0
+        with self._lock:
+            for tag in tags:
+                for key in list(self._tags.get(tag, ())):
+                    self._remove(key)
+                    removed += 1
+            self.invalidations += removed
+        return removed
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+            self.size = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Get cache counters."""
+        return {
+            "entries": len(self._entries),
+            "bytes": self.size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+# Global response cache instance
+_response_cache = ResponseCache()
+
+
+def init_response_cache(**kwargs) -> ResponseCache:
+    """Replace the global response cache.
+
+    Args:
+        **kwargs: Response cache configuration
+
+    Returns:
+        Response cache
+    """
+    global _response_cache
+    _response_cache = ResponseCache(**kwargs)
+    return _response_cache
+
+
+def get_response_cache() -> ResponseCache:
+    """Get global response cache."""
+    return _response_cache
+
+
+def invalidate_cache_tags(*tags: str) -> int:
+    """Drop entries with any of the tags from the global response cache."""
+    return _response_cache.invalidate_tags(*tags)
+
+
+class ResponseCacheMiddleware:
+    """Serve cached GET responses for configured route prefixes.
+
+    Successful (200) responses are buffered, given a strong ``ETag`` and
+    stored for the rule's TTL. Later requests with the same key are served
+    from the cache without running the endpoint, and a matching
+    ``If-None-Match`` gets a bodiless 304. The key is built from the path,
+    normalized query string, the principal (unless the rule is public),
+    ``key_func``, if given, and the request headers named in the
+    responses' ``Vary`` (learned per rule). Without a resolved principal,
+    the caller is identified by a hash of its ``Authorization`` or
+    ``Cookie`` header.
+
+    Tags come from the rule and from ``add_cache_tags`` in the endpoint;
+    call ``invalidate_cache_tags`` after writes to purge stale entries.
+    Responses that set cookies, send ``Cache-Control: no-store`` or
+    ``Vary: *``, or (under public rules) ``Cache-Control: private`` are
+    not cached. The stored ``Date`` header is dropped so the server dates
+    each response it sends.
+
+    Usage:
+        app.add_middleware(
+            ResponseCacheMiddleware,
+            rules={"/leaderboard": CacheRule(
+                GamificationLimits.LEADERBOARD_CACHE_TTL,
+                per_principal=False,
+                tags=("leaderboard",)
+            )}
+        )
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        rules: Dict[str, CacheRule],
+        cache: Optional[ResponseCache] = None,
+        key_func: Optional[Callable[[Scope], str]] = None,
+        registry: Optional[MetricsRegistry] = None
+    ):
+        """Initialize response cache middleware.
+
+        Args:
+            app: ASGI application
+            rules: Path prefix to caching policy
+            cache: Response store (default: global response cache)
+            key_func: Extra cache key component computed from the ASGI scope
+            registry: Metrics registry (default: global registry)
+        """
+        self.app = app
+        self.rules = sorted(rules.items(), key=lambda item: len(item[0]), reverse=True)
+        self._cache = cache
+        self.key_func = key_func
+        # Request headers named in Vary by responses under each rule prefix
+        self._vary: Dict[str, Tuple[bytes, ...]] = {}
+        self.registry = registry or get_metrics_registry()
+        self.registry.describe("response_cache_requests_total", "Cacheable requests by cache result")
+
+    @property
+    def cache(self) -> ResponseCache:
+        return self._cache or get_response_cache()
+
+    def _rule(self, path: str) -> Optional[Tuple[str, CacheRule]]:
+        for prefix, rule in self.rules:
+            if path.startswith(prefix):
+                return prefix, rule
+        return None
+
+    def _key(self, scope: Scope, rule: CacheRule, vary: Tuple[bytes, ...]) -> CacheKey:
+        principal = _principal_scope(scope) if rule.per_principal else None
+        extra = self.key_func(scope) if self.key_func else ""
+        key = (scope["path"], _normalized_query(scope), principal or "", extra)
+        if not vary:
+            return key
+        values = dict.fromkeys(vary, b"")
+        for name, value in scope["headers"]:
+            if name in values:
+                values[name] = value if not values[name] else values[name] + b"," + value
+        return (*key, *(value.decode("latin-1") for value in values.values()))
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        matched = self._rule(scope["path"])
+        if matched is None:
+            await self.app(scope, receive, send)
+            return
+        prefix, rule = matched
+
+        cache = self.cache
+        key = self._key(scope, rule, self._vary.get(prefix, ()))
+        if_none_match = None
+        for name, value in scope["headers"]:
+            if name == b"if-none-match":
+                if_none_match = value
+                break
+
+        entry = cache.get(key)
+        if entry is not None:
+            self.registry.inc("response_cache_requests_total", route=prefix, result="hit")
+            age = str(int(time.monotonic() - entry.stored_at)).encode("latin-1")
+            await self._send_entry(send, entry, if_none_match, [(b"age", age), (b"x-cache", b"HIT")])
+            return
+
+        self.registry.inc("response_cache_requests_total", route=prefix, result="miss")
+        await self._fetch(scope, receive, send, cache, prefix, rule, if_none_match)
+
+    async def _fetch(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+        cache: ResponseCache,
+        prefix: str,
+        rule: CacheRule,
+        if_none_match: Optional[bytes]
+    ) -> None:
+        start: Optional[Message] = None
+        chunks: List[bytes] = []
+        buffered = 0
+        passthrough = False
+
+        async def send_buffered(message: Message) -> None:
+            nonlocal start, buffered, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                start = message
+                if not _cacheable(message, rule):
+                    passthrough = True
+                    await send(message)
+                return
+
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            chunks.append(body)
+            buffered += len(body)
+
+            if buffered > cache.max_entry_bytes:
+                # Too large to cache: flush what we have and stream the rest
+                passthrough = True
+                await send(start)
+                await send({
+                    "type": "http.response.body",
+                    "body": b"".join(chunks),
+                    "more_body": message.get("more_body", False)
+                })
+                return
+
+            if not message.get("more_body", False):
+                body = b"".join(chunks)
+                now = time.monotonic()
+                tags = (*rule.tags, *scope.get("state", {}).get("cache_tags", ()))
+                vary = self._learn_vary(prefix, start)
+                entry = CachedResponse(
+                    status=start["status"],
+                    headers=[
+                        (name, value) for name, value in start.get("headers", ())
+                        if name.lower() not in _UNSTORED_HEADERS
+                    ],
+                    body=body,
+                    etag=compute_etag(body),
+                    stored_at=now,
+                    expires_at=now + rule.ttl,
+                    tags=tags
+                )
+                cache.put(self._key(scope, rule, vary), entry)
+                await self._send_entry(send, entry, if_none_match, [(b"x-cache", b"MISS")])
+
+        await self.app(scope, receive, send_buffered)
+
+    def _learn_vary(self, prefix: str, start: Message) -> Tuple[bytes, ...]:
+        """Add the response's Vary header names to the rule's key headers."""
+        names = set(self._vary.get(prefix, ()))
+        known = len(names)
+        for name, value in start.get("headers", ()):
+            if name.lower() == b"vary":
+                names.update(part.strip().lower() for part in value.split(b",") if part.strip())
+        if len(names) == known:
+            return self._vary.get(prefix, ())
+        vary = tuple(sorted(names))
+        self._vary[prefix] = vary
+        return vary
+
+    @staticmethod
+    async def _send_entry(
+        send: Send,
+        entry: CachedResponse,
+        if_none_match: Optional[bytes],
+        extra_headers: Iterable[Tuple[bytes, bytes]]
+    ) -> None:
+        if if_none_match is not None and etag_matches(if_none_match, entry.etag):
+            headers = [
+                (name, value) for name, value in entry.headers
+                if name.lower() in _NOT_MODIFIED_HEADERS
+            ]
+            await send({
+                "type": "http.response.start",
+                "status": 304,
+                "headers": [*headers, (b"etag", entry.etag), *extra_headers]
+            })
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        await send({
+            "type": "http.response.start",
+            "status": entry.status,
+            "headers": [*entry.headers, (b"etag", entry.etag), *extra_headers]
+        })
+        await send({"type": "http.response.body", "body": entry.body})
+
+
+# Headers a 304 response repeats from the full response (RFC 9110 15.4.5)
+_NOT_MODIFIED_HEADERS = frozenset((b"cache-control", b"content-location", b"date", b"expires", b"vary"))
+
+
+# Response headers not kept with a cached entry
+_UNSTORED_HEADERS = frozenset((b"etag", b"date"))
+
+
+def _cacheable(start: Message, rule: CacheRule) -> bool:
+    if start["status"] != 200:
+        return False
+    for name, value in start.get("headers", ()):
+        name = name.lower()
+        if name == b"set-cookie":
+            return False
+        if name == b"cache-control":
+            value = value.lower()
+            if b"no-store" in value:
+                return False
+            # Private responses may only be shared with the same principal
+            if b"private" in value and not rule.per_principal:
+                return False
+        if name == b"vary" and value.strip() == b"*":
+            return False
+    return True
@@ -4,12 +4,14 @@ from .common import (
     PaginationParams, PaginatedResponse, ErrorResponse,
     SuccessResponse, HealthCheckResponse
 )
+from .serialization import ModelJSONResponse, dump_json, paginated_adapter, render_paginated
 from .auth import TokenData, UserClaims
 from .events import EventBase, ProgressEvent, GamificationEvent
 
 __all__ = [
     "PaginationParams", "PaginatedResponse", "ErrorResponse",
     "SuccessResponse", "HealthCheckResponse",
+    "ModelJSONResponse", "dump_json", "paginated_adapter", "render_paginated",
     "TokenData", "UserClaims",
     "EventBase", "ProgressEvent", "GamificationEvent"
 ]
\ No newline at end of file
@@ -2,7 +2,7 @@
 
 from typing import Any, Dict, List, Optional, Generic, TypeVar
 from datetime import datetime
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, field_serializer
 
 T = TypeVar('T')
 
@@ -59,12 +59,11 @@ class TimestampedModel(BaseModel):
     """Base model with timestamps."""
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: Optional[datetime] = None
-    
-    model_config = ConfigDict(
-        json_encoders={
-            datetime: lambda v: v.isoformat()
-        }
-    )
+
+    @field_serializer("created_at", "updated_at", when_used="json-unless-none")
+    def _serialize_timestamp(self, value: datetime) -> str:
+        # Keep the isoformat() output (+00:00 rather than Z)
+        return value.isoformat()
 
 
 class AuditedModel(TimestampedModel):
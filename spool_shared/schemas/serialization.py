@@ -0,0 +1,85 @@
+"""Fast JSON rendering of Pydantic models."""
+
+import math
+from functools import lru_cache
+from typing import Any, Optional, Sequence, Type
+
+import pydantic_core
+from pydantic import BaseModel, TypeAdapter
+from starlette.responses import JSONResponse
+
+from .common import PaginatedResponse
+
+
+def dump_json(content: Any) -> bytes:
+    """Serialize models (or containers of them) straight to JSON bytes.
+
+    Uses pydantic-core's serializer, so models, datetimes, UUIDs and enums
+    are encoded in one pass without an intermediate dict.
+
+    Args:
+        content: Model, dict, list or other JSON-compatible value
+
+    Returns:
+        JSON bytes
+    """
+    if isinstance(content, BaseModel):
+        return content.__pydantic_serializer__.to_json(content)
+    return pydantic_core.to_json(content)
+
+
+class ModelJSONResponse(JSONResponse):
+    """JSON response rendered with pydantic-core instead of ``json.dumps``.
+
+    Accepts models directly, so there is no ``model_dump`` round trip
+    through Python dicts. Pre-rendered JSON bytes are sent as-is.
+
+    Usage:
+        return ModelJSONResponse(page)
+        return ModelJSONResponse(render_paginated(items, total, page, size))
+
+        @app.get("/items", response_class=ModelJSONResponse)
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dump_json(content)
+
+
+@lru_cache(maxsize=256)
+def paginated_adapter(item_type: Type) -> TypeAdapter:
+    """Get the (cached) ``TypeAdapter`` for ``PaginatedResponse[item_type]``."""
+    return TypeAdapter(PaginatedResponse[item_type])
+
+
+def render_paginated(
+    items: Sequence[Any],
+    total: int,
+    page: int,
+    size: int,
+    item_type: Optional[Type] = None
+) -> bytes:
+    """Render a page of items as ``PaginatedResponse`` JSON bytes.
+
+    Args:
+        items: Items on this page (model instances or dicts)
+        total: Total number of items
+        page: Page number
+        size: Page size
+        item_type: Item schema (default: type of the first item)
+
+    Returns:
+        JSON bytes
+    """
+    if item_type is None:
+        item_type = type(items[0]) if items else Any
+    adapter = paginated_adapter(item_type)
+    paginated = adapter.validate_python({
+        "items": items,
+        "total": total,
+        "page": page,
+        "size": size,
+        "pages": math.ceil(total / size) if size else 0,
+    })
+    return adapter.dump_json(paginated)
@@ -3,9 +3,17 @@
 from .validators import validate_uuid, validate_email, validate_phone
 from .formatters import format_phone, format_currency, format_percentage
 from .date_utils import parse_date, format_date, calculate_age
+from .deadline import (
+    set_deadline, reset_deadline, get_deadline, remaining_time,
+    check_deadline, timeout_for
+)
+from .metrics import MetricsRegistry, get_metrics_registry
 
 __all__ = [
     "validate_uuid", "validate_email", "validate_phone",
     "format_phone", "format_currency", "format_percentage",
-    "parse_date", "format_date", "calculate_age"
+    "parse_date", "format_date", "calculate_age",
+    "set_deadline", "reset_deadline", "get_deadline", "remaining_time",
+    "check_deadline", "timeout_for",
+    "MetricsRegistry", "get_metrics_registry"
 ]
\ No newline at end of file
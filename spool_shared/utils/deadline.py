@@ -0,0 +1,123 @@
+"""Per-request deadlines carried in a context variable."""
+
+import time
+from contextvars import ContextVar, Token
+from typing import Optional
+
+from spool_shared.exceptions import DeadlineExceededException
+
+# Absolute deadline (Unix seconds) sent to and received from other services
+DEADLINE_HEADER = "X-Request-Deadline"
+# Relative time budget (seconds) accepted from clients
+TIMEOUT_HEADER = "X-Request-Timeout"
+
+# Deadline of the current request as a time.monotonic() value
+_deadline: ContextVar[Optional[float]] = ContextVar("spool_deadline", default=None)
+
+
+def parse_deadline(
+    deadline: Optional[str] = None,
+    timeout: Optional[str] = None,
+    max_timeout: Optional[float] = None
+) -> Optional[float]:
+    """Convert deadline/timeout header values to a time budget.
+
+    Args:
+        deadline: ``X-Request-Deadline`` value (Unix timestamp in seconds)
+        timeout: ``X-Request-Timeout`` value (seconds)
+        max_timeout: Upper bound for the budget
+
+    Returns:
+        Remaining seconds (may be <= 0), or None if no valid value was given
+    """
+    budgets = []
+    for value, absolute in ((deadline, True), (timeout, False)):
+        if not value:
+            continue
+        try:
+            seconds = float(value)
+        except ValueError:
+            continue
+        if seconds != seconds:  # NaN
+            continue
+        budgets.append(seconds - time.time() if absolute else seconds)
+
+    if max_timeout is not None:
+        budgets.append(max_timeout)
+    return min(budgets) if budgets else None
+
+
+def set_deadline(timeout: Optional[float]) -> Token:
+    """Set the deadline for the current context.
+
+    The deadline never extends an enclosing one.
+
+    Args:
+        timeout: Seconds from now, or None to inherit the current deadline
+
+    Returns:
+        Token for ``reset_deadline``
+    """
+    deadline = _deadline.get()
+    if timeout is not None:
+        candidate = time.monotonic() + timeout
+        if deadline is None or candidate < deadline:
+            deadline = candidate
+    return _deadline.set(deadline)
+
+
+def reset_deadline(token: Token) -> None:
+    """Restore the deadline in effect before ``set_deadline``."""
+    _deadline.reset(token)
+
+
+def get_deadline() -> Optional[float]:
+    """Get the current deadline as a ``time.monotonic()`` value."""
+    return _deadline.get()
+
+
+def remaining_time() -> Optional[float]:
+    """Get seconds left before the deadline (None if there is none)."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def check_deadline() -> None:
+    """Raise if the current deadline has passed.
+
+    Raises:
+        DeadlineExceededException: If no time is left
+    """
+    remaining = remaining_time()
+    if remaining is not None and remaining <= 0:
+        raise DeadlineExceededException()
+
+
+def timeout_for(default: Optional[float] = None) -> Optional[float]:
+    """Get a timeout for a blocking call that respects the deadline.
+
+    Args:
+        default: Timeout to use when there is more time than this (or no deadline)
+
+    Returns:
+        The smaller of ``default`` and the remaining time
+
+    Raises:
+        DeadlineExceededException: If no time is left
+    """
+    remaining = remaining_time()
+    if remaining is None:
+        return default
+    if remaining <= 0:
+        raise DeadlineExceededException()
+    return remaining if default is None else min(default, remaining)
+
+
+def deadline_header_value() -> Optional[str]:
+    """Get the ``X-Request-Deadline`` value to propagate downstream."""
+    remaining = remaining_time()
+    if remaining is None:
+        return None
+    return f"{time.time() + remaining:.3f}"
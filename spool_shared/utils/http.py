@@ -0,0 +1,68 @@
+"""Outbound HTTP helpers."""
+
+from typing import Any, Optional
+
+import httpx
+
+from spool_shared.exceptions import DeadlineExceededException
+
+from .deadline import DEADLINE_HEADER, deadline_header_value, remaining_time, timeout_for
+
+
+async def request(
+    method: str,
+    url: str,
+    client: Optional[httpx.AsyncClient] = None,
+    timeout: float = 10.0,
+    **kwargs: Any
+) -> httpx.Response:
+    """Make an HTTP request bounded by the current request deadline.
+
+    The timeout is the smaller of ``timeout`` and the time left before the
+    deadline, and the deadline is forwarded in ``X-Request-Deadline`` so
+    downstream services stop when we do.
+
+    Args:
+        method: HTTP method
+        url: Request URL
+        client: Client to send with (default: a one-off client)
+        timeout: Timeout when the deadline allows more time
+        **kwargs: Additional ``httpx`` request arguments
+
+    Returns:
+        HTTP response
+
+    Raises:
+        DeadlineExceededException: If the deadline passed before or during the call
+    """
+    effective_timeout = timeout_for(timeout)
+
+    headers = dict(kwargs.pop("headers", None) or {})
+    deadline = deadline_header_value()
+    if deadline is not None:
+        headers[DEADLINE_HEADER] = deadline
+
+    try:
+        if client is None:
+            async with httpx.AsyncClient() as one_off:
+                return await one_off.request(
+                    method, url, headers=headers, timeout=effective_timeout, **kwargs
+                )
+        return await client.request(
+            method, url, headers=headers, timeout=effective_timeout, **kwargs
+        )
+    except httpx.TimeoutException:
+        remaining = remaining_time()
+        if remaining is not None and remaining <= 0:
+            raise DeadlineExceededException() from None
+        raise
+
+
+async def get(url: str, **kwargs: Any) -> httpx.Response:
+    """Make a deadline-bounded GET request (see ``request``)."""
+    return await request("GET", url, **kwargs)
+
+
+async def post(url: str, **kwargs: Any) -> httpx.Response:
+    """Make a deadline-bounded POST request (see ``request``)."""
+    return await request("POST", url, **kwargs)
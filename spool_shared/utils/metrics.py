@@ -0,0 +1,239 @@
+"""In-process metrics registry."""
+
+import threading
+from typing import Dict, List, Tuple
+
+# Log-linear (HDR-style) buckets over integer microseconds: values below
+# 2**SUB_BUCKET_BITS get their own bucket, above that each power of two is
+# split into 2**(SUB_BUCKET_BITS - 1) buckets (~12% relative precision).
+SUB_BUCKET_BITS = 4
+_LINEAR = 1 << SUB_BUCKET_BITS
+_HALF = _LINEAR >> 1
+BUCKET_COUNT = 256  # covers beyond 10**9 us
+_COUNT = BUCKET_COUNT
+_SUM = BUCKET_COUNT + 1
+
+# Bucket boundaries (seconds) used for Prometheus exposition
+EXPOSITION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelSet = Tuple[Tuple[str, str], ...]
+
+
+def bucket_index(micros: int) -> int:
+    """Get histogram bucket index for a value in microseconds."""
+    if micros < _LINEAR:
+        return micros if micros > 0 else 0
+    shift = micros.bit_length() - SUB_BUCKET_BITS
+    index = _LINEAR + (shift - 1) * _HALF + (micros >> shift) - _HALF
+    return index if index < BUCKET_COUNT else BUCKET_COUNT - 1
+
+
+def bucket_upper_bound(index: int) -> int:
+    """Get exclusive upper bound (microseconds) of a bucket."""
+    if index < _LINEAR:
+        return index + 1
+    offset = index - _LINEAR
+    shift = offset // _HALF + 1
+    return (offset % _HALF + _HALF + 1) << shift
+
+
+class LatencyHistogram:
+    """Merged, read-only view of a latency histogram."""
+
+    def __init__(self, counts: List[int]):
+        self._counts = counts
+
+    @property
+    def count(self) -> int:
+        """Number of recorded values."""
+        return self._counts[_COUNT]
+
+    @property
+    def sum(self) -> float:
+        """Sum of recorded values in seconds."""
+        return self._counts[_SUM] / 1e6
+
+    def percentile(self, q: float) -> float:
+        """Estimate a percentile.
+
+        Args:
+            q: Percentile between 0 and 100
+
+        Returns:
+            Upper bound (seconds) of the bucket holding the percentile
+        """
+        total = self.count
+        if total == 0:
+            return 0.0
+        rank = max(1, int(total * q / 100 + 0.5))
+        seen = 0
+        for index in range(BUCKET_COUNT):
+            seen += self._counts[index]
+            if seen >= rank:
+                return bucket_upper_bound(index) / 1e6
+        return bucket_upper_bound(BUCKET_COUNT - 1) / 1e6
+
+    def cumulative(self, bounds: Tuple[float, ...] = EXPOSITION_BUCKETS) -> List[int]:
+        """Get cumulative counts at each bound (seconds)."""
+        result = []
+        index = 0
+        seen = 0
+        for bound in bounds:
+            limit = int(bound * 1e6)
+            while index < BUCKET_COUNT and bucket_upper_bound(index) <= limit:
+                seen += self._counts[index]
+                index += 1
+            result.append(seen)
+        return result
+
+
+class MetricsRegistry:
+    """Registry of counters, gauges and latency histograms.
+
+    Counters and histograms are recorded into per-thread shards without
+    locks and merged when read, so recording never contends.
+    """
+
+    def __init__(self, namespace: str = "spool"):
+        """Initialize registry.
+
+        Args:
+            namespace: Prefix for exposed metric names
+        """
+        self.namespace = namespace
+        self._local = threading.local()
+        self._shards: List[Tuple[Dict, Dict]] = []
+        self._shards_lock = threading.Lock()
+        self._gauges: Dict[Tuple[str, LabelSet], float] = {}
+        self._help: Dict[str, str] = {}
+
+    def _shard(self) -> Tuple[Dict, Dict]:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = ({}, {})
+            with self._shards_lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+            return shard
+
+    def describe(self, name: str, help_text: str) -> None:
+        """Set help text shown for a metric."""
+        self._help[name] = help_text
+
+    def inc(self, name: str, amount: float = 1, **labels: str) -> None:
+        """Increment a counter."""
+        counters = self._shard()[0]
+        key = (name, tuple(labels.items()))
+        counters[key] = counters.get(key, 0) + amount
+
+    def set_gauge(self, name: str, value: float, **labels: str) -> None:
+        """Set a gauge value."""
+        self._gauges[(name, tuple(labels.items()))] = value
+
+    def add_gauge(self, name: str, amount: float, **labels: str) -> None:
+        """Adjust a gauge value.
+
+        Only call from a single thread (e.g. the event loop) per gauge.
+        """
+        key = (name, tuple(labels.items()))
+        self._gauges[key] = self._gauges.get(key, 0) + amount
+
+    def observe(self, name: str, seconds: float, **labels: str) -> None:
+        """Record a duration in a latency histogram."""
+        histograms = self._shard()[1]
+        key = (name, tuple(labels.items()))
+        counts = histograms.get(key)
+        if counts is None:
+            counts = histograms[key] = [0] * (BUCKET_COUNT + 2)
+        micros = int(seconds * 1e6)
+        counts[bucket_index(micros)] += 1
+        counts[_COUNT] += 1
+        counts[_SUM] += micros
+
+    def counter_value(self, name: str, **labels: str) -> float:
+        """Get merged value of a counter."""
+        key = (name, tuple(labels.items()))
+        return sum(counters.get(key, 0) for counters, _ in list(self._shards))
+
+    def gauge_value(self, name: str, **labels: str) -> float:
+        """Get value of a gauge."""
+        return self._gauges.get((name, tuple(labels.items())), 0)
+
+    def histogram(self, name: str, **labels: str) -> LatencyHistogram:
+        """Get merged view of a histogram."""
+        key = (name, tuple(labels.items()))
+        merged = [0] * (BUCKET_COUNT + 2)
+        for _, histograms in list(self._shards):
+            counts = histograms.get(key)
+            if counts is not None:
+                merged = [a + b for a, b in zip(merged, counts)]
+        return LatencyHistogram(merged)
+
+    def _merged(self) -> Tuple[Dict, Dict]:
+        counters: Dict[Tuple[str, LabelSet], float] = {}
+        histograms: Dict[Tuple[str, LabelSet], List[int]] = {}
+        for shard_counters, shard_histograms in list(self._shards):
+            for key, value in list(shard_counters.items()):
+                counters[key] = counters.get(key, 0) + value
+            for key, counts in list(shard_histograms.items()):
+                merged = histograms.get(key)
+                histograms[key] = list(counts) if merged is None else [
+                    a + b for a, b in zip(merged, counts)
+                ]
+        return counters, histograms
+
+    def render_prometheus(self) -> str:
+        """Render all metrics in Prometheus text exposition format."""
+        counters, histograms = self._merged()
+        lines: List[str] = []
+
+        def header(name: str, kind: str) -> str:
+            full_name = f"{self.namespace}_{name}"
+            if name in self._help:
+                lines.append(f"# HELP {full_name} {self._help[name]}")
+            lines.append(f"# TYPE {full_name} {kind}")
+            return full_name
+
+        for kind, series in (("counter", counters), ("gauge", dict(self._gauges))):
+            for name in sorted({key[0] for key in series}):
+                full_name = header(name, kind)
+                for (series_name, labels), value in series.items():
+                    if series_name == name:
+                        lines.append(f"{full_name}{_format_labels(labels)} {value}")
+
+        for name in sorted({key[0] for key in histograms}):
+            full_name = header(name, "histogram")
+            for (series_name, labels), counts in histograms.items():
+                if series_name != name:
+                    continue
+                histogram = LatencyHistogram(counts)
+                for bound, cumulative in zip(EXPOSITION_BUCKETS, histogram.cumulative()):
+                    bucket_labels = labels + (("le", str(bound)),)
+                    lines.append(f"{full_name}_bucket{_format_labels(bucket_labels)} {cumulative}")
+                inf_labels = labels + (("le", "+Inf"),)
+                lines.append(f"{full_name}_bucket{_format_labels(inf_labels)} {histogram.count}")
+                lines.append(f"{full_name}_sum{_format_labels(labels)} {histogram.sum}")
+                lines.append(f"{full_name}_count{_format_labels(labels)} {histogram.count}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels: LabelSet) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{key}="{_escape_label(value)}"' for key, value in labels)
+    return "{" + pairs + "}"
+
+
+def _escape_label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Global metrics registry
+_registry = MetricsRegistry()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Get global metrics registry."""
+    return _registry
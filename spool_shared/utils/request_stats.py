@@ -0,0 +1,65 @@
+"""Per-request statistics collected across layers."""
+
+from contextvars import ContextVar, Token
+from typing import Any, Callable, Dict, List, Optional
+
+
+class RequestStats:
+    """Mutable statistics for one request.
+
+    Started by ``LoggingMiddleware`` and shared (by reference) with every
+    context copied from the request, including thread pool calls, so any
+    layer can add to it. Its fields are included in the request's log
+    record.
+    """
+
+    __slots__ = ("fields", "state", "route", "_finalizers")
+
+    def __init__(self) -> None:
+        self.fields: Dict[str, Any] = {}
+        # Per-request objects other layers keep here (not logged)
+        self.state: Dict[str, Any] = {}
+        # Route template, set before finish callbacks run
+        self.route: Optional[str] = None
+        self._finalizers: List[Callable[["RequestStats"], None]] = []
+
+    def add(self, name: str, amount: float) -> None:
+        """Add to a numeric field."""
+        self.fields[name] = self.fields.get(name, 0) + amount
+
+    def set(self, name: str, value: Any) -> None:
+        """Set a field."""
+        self.fields[name] = value
+
+    def on_finish(self, callback: Callable[["RequestStats"], None]) -> None:
+        """Run a callback (e.g. to summarize collected data) when the request ends."""
+        self._finalizers.append(callback)
+
+    def finish(self) -> Dict[str, Any]:
+        """Run finish callbacks and get the final fields."""
+        finalizers, self._finalizers = self._finalizers, []
+        for callback in finalizers:
+            callback(self)
+        return self.fields
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("spool_request_stats", default=None)
+
+
+def start_request_stats() -> Token:
+    """Start collecting statistics for the current request.
+
+    Returns:
+        Token for ``reset_request_stats``
+    """
+    return _request_stats.set(RequestStats())
+
+
+def reset_request_stats(token: Token) -> None:
+    """Stop collecting statistics for the current request."""
+    _request_stats.reset(token)
+
+
+def get_request_stats() -> Optional[RequestStats]:
+    """Get statistics of the current request, if collecting."""
+    return _request_stats.get()
@@ -0,0 +1,392 @@
+"""Cross-process counters in shared memory."""
+
+import asyncio
+import errno
+import fcntl
+import hashlib
+import math
+import os
+import tempfile
+import threading
+import time
+from functools import lru_cache
+from multiprocessing import resource_tracker, shared_memory
+from typing import Optional, Tuple
+
+from spool_shared.constants.limits import GamificationLimits
+
+# Slot fields stored as float64 next to each key hash
+_VALUE, _STAMP, _WINDOW = 0, 1, 2
+_FIELDS = 3
+_DAY_SECONDS = 86400
+
+# Async stripe lock waits: first and largest sleep between attempts, and
+# the total wait after which the operation fails open
+_LOCK_BACKOFF_START = 0.0001
+_LOCK_BACKOFF_MAX = 0.005
+_LOCK_WAIT_LIMIT = 0.05
+
+
+@lru_cache(maxsize=65536)
+def _key_hash(key: str) -> int:
+    """Stable 64-bit key hash (``hash()`` differs between processes)."""
+    digest = int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little")
+    return digest or 1  # 0 marks an empty slot
+
+
+class SharedCounterTable:
+    """Fixed-size hash table of counters shared by all processes on a host.
+
+    Intended for uvicorn workers in one container: every worker opens the
+    table by name, and all of them see the same counters without a network
+    round trip. The table is split into stripes, each guarded by an
+    in-process lock plus an ``fcntl`` byte-range lock on a lock file, and a
+    key only ever probes slots within its own stripe.
+
+    The ``*_async`` methods never block the event loop on a stripe lock:
+    they try to take it without waiting and sleep between attempts, backing
+    off up to a few milliseconds, so contention with other workers stalls
+    only the waiting request. After 50ms without the lock they fail open.
+
+    Slots are never freed; a slot whose window has passed is reused for a
+    new key. If a stripe has no usable slot the operation fails open.
+    """
+
+    def __init__(
+        self,
+        name: str = "spool-counters",
+        slots: int = 65536,
+        stripes: int = 256,
+        max_probe: int = 32,
+        lock_dir: Optional[str] = None
+    ):
+        """Create or attach to a shared counter table.
+
+        Args:
+            name: Shared memory block name (same in every worker)
+            slots: Total number of counter slots
+            stripes: Number of lock stripes (must divide ``slots``)
+            max_probe: Maximum slots probed per lookup
+            lock_dir: Directory for the lock file (default: temp dir)
+        """
+        if slots % stripes:
+            raise ValueError("stripes must divide slots")
+
+        self.name = name
+        self.slots = slots
+        self.stripes = stripes
+        self.stripe_size = slots // stripes
+        self.max_probe = min(max_probe, self.stripe_size)
+
+        key_bytes = 8 * slots
+        size = key_bytes + 8 * _FIELDS * slots
+        try:
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            self._shm = shared_memory.SharedMemory(name=name)
+            if self._shm.size < size:
+                raise ValueError(f"Shared counter table {name!r} is smaller than configured")
+
+        # Workers come and go; the block must outlive whichever one created it
+        try:
+            resource_tracker.unregister(self._shm._name, "shared_memory")
+        except Exception:
+            pass
+
+        self._keys = self._shm.buf[:key_bytes].cast("Q")
+        self._values = self._shm.buf[key_bytes:size].cast("d")
+
+        lock_path = os.path.join(lock_dir or tempfile.gettempdir(), f"{name}.lock")
+        self._lock_fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._thread_locks = [threading.Lock() for _ in range(stripes)]
+        self.fail_open = 0
+
+    def _locked(self, stripe: int) -> "_StripeLock":
+        return _StripeLock(self._thread_locks[stripe], self._lock_fd, stripe)
+
+    async def _acquire_async(self, stripe: int) -> Optional["_StripeLock"]:
+        """Take a stripe lock without blocking the event loop.
+
+        Returns:
+            The held lock, or None (counted in ``fail_open``) if it stayed
+            busy for ``_LOCK_WAIT_LIMIT`` seconds
+        """
+        lock = self._locked(stripe)
+        delay = _LOCK_BACKOFF_START
+        deadline = time.monotonic() + _LOCK_WAIT_LIMIT
+        while not lock.try_acquire():
+            if time.monotonic() >= deadline:
+                self.fail_open += 1
+                return None
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, _LOCK_BACKOFF_MAX)
+        return lock
+
+    def _find_slot(self, key_hash: int, stripe: int, now: float) -> Optional[int]:
+        """Find the key's slot, claiming a free or expired one if needed.
+
+        Must be called with the stripe locked.
+        """
+        keys = self._keys
+        values = self._values
+        base = stripe * self.stripe_size
+        start = key_hash % self.stripe_size
+        reusable = None
+
+        for probe in range(self.max_probe):
+            slot = base + (start + probe) % self.stripe_size
+            slot_key = keys[slot]
+            if slot_key == key_hash:
+                return slot
+            if slot_key == 0:
+                if reusable is None:
+                    reusable = slot
+                break
+            if reusable is None:
+                offset = slot * _FIELDS
+                if values[offset + _STAMP] + values[offset + _WINDOW] <= now:
+                    reusable = slot
+
+        if reusable is not None:
+            keys[reusable] = key_hash
+            offset = reusable * _FIELDS
+            values[offset + _VALUE] = 0.0
+            values[offset + _STAMP] = 0.0
+            values[offset + _WINDOW] = 0.0
+        return reusable
+
+    def _locate(self, key: str) -> Tuple[int, int]:
+        key_hash = _key_hash(key)
+        return key_hash, (key_hash >> 32) % self.stripes
+
+    def take_token(self, key: str, limit: int, window: float) -> Tuple[bool, float]:
+        """Consume one token from a token bucket.
+
+        Args:
+            key: Bucket key
+            limit: Bucket capacity (requests per window; 0 denies every request)
+            window: Window length in seconds
+
+        Returns:
+            Tuple of (allowed, seconds until a token is available)
+        """
+        key_hash, stripe = self._locate(key)
+        with self._locked(stripe):
+            return self._take_token(key_hash, stripe, limit, window)
+
+    async def take_token_async(self, key: str, limit: int, window: float) -> Tuple[bool, float]:
+        """Consume one token without blocking the event loop (see ``take_token``)."""
+        key_hash, stripe = self._locate(key)
+        lock = await self._acquire_async(stripe)
+        if lock is None:
+            return True, 0.0
+        try:
+            return self._take_token(key_hash, stripe, limit, window)
+        finally:
+            lock.release()
+
+    async def refund_token_async(self, key: str, limit: int, window: float) -> None:
+        """Return a token taken by ``take_token`` (capped at ``limit``)."""
+        key_hash, stripe = self._locate(key)
+        lock = await self._acquire_async(stripe)
+        if lock is None:
+            return
+        try:
+            slot = self._find_slot(key_hash, stripe, time.time())
+            if slot is not None and self._values[slot * _FIELDS + _WINDOW] != 0.0:
+                offset = slot * _FIELDS
+                self._values[offset + _VALUE] = min(limit, self._values[offset + _VALUE] + 1)
+        finally:
+            lock.release()
+
+    def _take_token(self, key_hash: int, stripe: int, limit: int, window: float) -> Tuple[bool, float]:
+        """Token bucket update; must be called with the stripe locked."""
+        if limit <= 0:
+            return False, window
+        refill = limit / window
+        now = time.time()
+        slot = self._find_slot(key_hash, stripe, now)
+        if slot is None:
+            self.fail_open += 1
+            return True, 0.0
+
+        values = self._values
+        offset = slot * _FIELDS
+        if values[offset + _WINDOW] == 0.0:
+            tokens = float(limit)
+        else:
+            elapsed = now - values[offset + _STAMP]
+            tokens = min(limit, values[offset + _VALUE] + elapsed * refill)
+
+        values[offset + _STAMP] = now
+        values[offset + _WINDOW] = window
+        if tokens >= 1:
+            values[offset + _VALUE] = tokens - 1
+            return True, 0.0
+
+        values[offset + _VALUE] = tokens
+        return False, (1 - tokens) / refill
+
+    def add_in_window(
+        self,
+        key: str,
+        amount: float,
+        limit: float,
+        window: float
+    ) -> Tuple[bool, float]:
+        """Add to a counter that resets at fixed window boundaries.
+
+        The amount is only added if the total stays within ``limit``.
+
+        Args:
+            key: Counter key
+            amount: Amount to add
+            limit: Maximum total per window
+            window: Window length in seconds (aligned to the Unix epoch)
+
+        Returns:
+            Tuple of (added, total in the current window)
+        """
+        key_hash, stripe = self._locate(key)
+        with self._locked(stripe):
+            return self._add_in_window(key_hash, stripe, amount, limit, window)
+
+    async def add_in_window_async(
+        self,
+        key: str,
+        amount: float,
+        limit: float,
+        window: float
+    ) -> Tuple[bool, float]:
+        """Add to a windowed counter without blocking the event loop (see ``add_in_window``)."""
+        key_hash, stripe = self._locate(key)
+        lock = await self._acquire_async(stripe)
+        if lock is None:
+            return True, amount
+        try:
+            return self._add_in_window(key_hash, stripe, amount, limit, window)
+        finally:
+            lock.release()
+
+    def _add_in_window(
+        self,
+        key_hash: int,
+        stripe: int,
+        amount: float,
+        limit: float,
+        window: float
+    ) -> Tuple[bool, float]:
+        """Windowed counter update; must be called with the stripe locked."""
+        now = time.time()
+        window_start = math.floor(now / window) * window
+        slot = self._find_slot(key_hash, stripe, now)
+        if slot is None:
+            self.fail_open += 1
+            return True, amount
+
+        values = self._values
+        offset = slot * _FIELDS
+        total = values[offset + _VALUE] if values[offset + _STAMP] == window_start else 0.0
+
+        values[offset + _STAMP] = window_start
+        values[offset + _WINDOW] = window
+        if total + amount > limit:
+            values[offset + _VALUE] = total
+            return False, total
+
+        values[offset + _VALUE] = total + amount
+        return True, total + amount
+
+    def close(self) -> None:
+        """Detach from the table (other workers keep using it)."""
+        self._keys.release()
+        self._values.release()
+        self._shm.close()
+        os.close(self._lock_fd)
+
+    def unlink(self) -> None:
+        """Remove the shared memory block (call once, on host shutdown)."""
+        # Re-register so unlink's own unregister call finds it
+        resource_tracker.register(self._shm._name, "shared_memory")
+        self._shm.unlink()
+
+
+class _StripeLock:
+    """Exclusive lock on one stripe across threads and processes."""
+
+    __slots__ = ("_thread_lock", "_fd", "_stripe")
+
+    def __init__(self, thread_lock: threading.Lock, fd: int, stripe: int):
+        self._thread_lock = thread_lock
+        self._fd = fd
+        self._stripe = stripe
+
+    def __enter__(self) -> None:
+        self._thread_lock.acquire()
+        try:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, 1, self._stripe)
+        except BaseException:
+            self._thread_lock.release()
+            raise
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+    def try_acquire(self) -> bool:
+        """Take the lock if it is free right now; never waits."""
+        if not self._thread_lock.acquire(blocking=False):
+            return False
+        try:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX | fcntl.LOCK_NB, 1, self._stripe)
+        except OSError as e:
+            self._thread_lock.release()
+            if e.errno in (errno.EAGAIN, errno.EACCES):
+                return False
+            raise
+        except BaseException:
+            self._thread_lock.release()
+            raise
+        return True
+
+    def release(self) -> None:
+        """Release a lock taken with ``__enter__`` or ``try_acquire``."""
+        try:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, 1, self._stripe)
+        finally:
+            self._thread_lock.release()
+
+
+class DailyPointsCap:
+    """Enforce ``GamificationLimits.MAX_DAILY_POINTS`` across workers."""
+
+    def __init__(self, table: SharedCounterTable, limit: int = GamificationLimits.MAX_DAILY_POINTS):
+        """Initialize daily cap.
+
+        Args:
+            table: Shared counter table
+            limit: Maximum points per user per UTC day
+        """
+        self.table = table
+        self.limit = limit
+
+    def try_award(self, user_id: str, points: int) -> Tuple[bool, int]:
+        """Record points if the user stays within today's cap.
+
+        Args:
+            user_id: User receiving the points
+            points: Points to award
+
+        Returns:
+            Tuple of (awarded, points awarded today)
+        """
+        awarded, total = self.table.add_in_window(
+            f"daily_points:{user_id}", points, self.limit, _DAY_SECONDS
+        )
+        return awarded, int(total)
+
+    async def try_award_async(self, user_id: str, points: int) -> Tuple[bool, int]:
+        """Record points without blocking the event loop (see ``try_award``)."""
+        awarded, total = await self.table.add_in_window_async(
+            f"daily_points:{user_id}", points, self.limit, _DAY_SECONDS
+        )
+        return awarded, int(total)